@@ -1,7 +1,11 @@
+from .caching import *
+from .compression import *
 from .loading import *
 from .writing import *
+from .sharding import *
+from .snapshot import *
 from .downloading import *
 from .api import *
 
 
-__all__ = downloading.__all__ + loading.__all__ + writing.__all__ + api.__all__  # type: ignore
+__all__ = caching.__all__ + compression.__all__ + downloading.__all__ + loading.__all__ + writing.__all__ + sharding.__all__ + snapshot.__all__ + api.__all__  # type: ignore
@@ -1,4 +1,6 @@
+from .batching import *
 from .endpoint import *
+from .lexicon import *
 
 
-__all__ = endpoint.__all__  # type: ignore
+__all__ = batching.__all__ + endpoint.__all__ + lexicon.__all__  # type: ignore
@@ -0,0 +1,93 @@
+"""Batching gathers windows of concurrent requests into model batches."""
+
+# Standard library imports
+from concurrent.futures import Future
+import queue
+import threading
+import time
+from typing import Callable
+
+# Local library imports
+from manx.config import settings
+
+
+__all__ = ["Batcher"]
+
+
+class Batcher:
+    """Batcher passes windows queued by many threads to the model in batches.
+
+    A batch is sent to `predict` as soon as it holds `max_batch_size` windows
+    or `max_wait` seconds after its first window was queued, whichever comes
+    first, so no window waits longer than `max_wait` for a batch to fill.
+    The model is only ever called from the single batching thread, and each
+    caller gets back the predictions of its own windows.
+    """
+
+    def __init__(
+        self,
+        predict: Callable[[list[str]], list[str]],
+        max_batch_size: int = settings.API_MAX_BATCH_SIZE,
+        max_wait: float = settings.API_MAX_WAIT,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError(f"invalid batch size: {max_batch_size}")
+        self.predict = predict
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.batches = 0
+        self._queue: queue.SimpleQueue[tuple[str, Future[str]]] = (
+            queue.SimpleQueue()
+        )
+        self._lock = threading.Lock()
+        self._worker: threading.Thread | None = None
+
+    def __call__(self, windows: list[str]) -> list[str]:
+        """Predict the windows along with those of other callers."""
+        futures = [self.submit(w) for w in windows]
+        return [f.result() for f in futures]
+
+    def submit(self, window: str) -> Future[str]:
+        """Queue the window for the next batch."""
+        future: Future[str] = Future()
+        self._start()
+        self._queue.put((window, future))
+        return future
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="manx-batcher", daemon=True
+                )
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                try:
+                    if timeout > 0:
+                        batch.append(self._queue.get(timeout=timeout))
+                    else:
+                        batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._flush(batch)
+
+    def _flush(self, batch: list[tuple[str, Future[str]]]) -> None:
+        try:
+            preds = self.predict([w for w, _ in batch])
+            if len(preds) != len(batch):
+                raise ValueError(
+                    f"got {len(preds)} predictions for {len(batch)} windows"
+                )
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        self.batches += 1
+        for (_, future), pred in zip(batch, preds):
+            future.set_result(pred)
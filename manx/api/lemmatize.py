@@ -1,14 +1,20 @@
 """Lemmatization router."""
 
 # Standard library imports
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
 import logging
-from typing import Callable
+from typing import Any, Callable
 
 # Third-party library imports
 from fastapi import status, APIRouter
 
 # Local library imports
+from .batching import Batcher
 from .data_model import Request, Response
+from .lexicon import default, Lexicon
+from manx.config import settings
 from manx.model import t5
 
 
@@ -19,8 +25,14 @@ v1 = APIRouter()
 
 @v1.post("/lemmatize")
 async def process(request: Request) -> Response:
-    """Lemmatize the provided early Middle English text."""
-    result = _process(**dict(request))
+    """Lemmatize the provided early Middle English text.
+
+    The text is stitched in the request executor, so the event loop keeps
+    serving other requests in the meantime, while its windows are predicted
+    in batches shared with concurrent requests.
+    """
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(executor(), _lemmatize, request)
     return Response(text=result)
 
 
@@ -30,36 +42,97 @@ async def health() -> int:
     return status.HTTP_200_OK
 
 
+@v1.get("/cache")
+async def cache_stats() -> dict[str, Any]:
+    """Report hits, misses and the size of the model prediction cache."""
+    if t5.cache is None:
+        return {}
+    return t5.cache.stats()
+
+
+@cache
+def executor() -> ThreadPoolExecutor:
+    """Executor of lemmatization requests bounded to API_WORKERS threads."""
+    return ThreadPoolExecutor(
+        max_workers=settings.API_WORKERS,
+        thread_name_prefix="manx-inference",
+    )
+
+
+@cache
+def batcher() -> Batcher:
+    """Batcher of windows of all requests passed to the T5 model."""
+    return Batcher(t5.predict_batch)
+
+
+def _lemmatize(request: Request) -> str:
+    return _process(
+        **dict(request),
+        predict=batcher(),
+        lexicon=default(),
+        batch_size=0,
+    )
+
+
 def _process(
     text: str,
     window_size: int = 11,
-    predict: Callable[[str], list[str]] = t5.predict,
+    predict: Callable[[list[str]], list[str]] = t5.predict_batch,
+    lexicon: Lexicon | None = None,
+    batch_size: int = settings.MODEL_BATCH_SIZE,
 ) -> str:
-    """Pass the text to get lemmatization prediction from the model."""
+    """Pass the text to get lemmatization prediction from the model.
+
+    All windows of the text are collected first and passed to the batched
+    `predict` in lists of up to `batch_size` windows, or all at once if it
+    is 0. With `lexicon` provided, windows whose every contributed word has
+    a lemma in the lexicon are not sent to the model at all.
+    """
     preds: list[str] = []
     words = [w for w in text.split() if w != ""]
+    lemmas = [lexicon.get(w) if lexicon else None for w in words]
     ngrams = list(
         zip(*[words[window_size:] for window_size in range(window_size)])
     )
     if len(ngrams) == 0:
+        if lexicon and _resolved(lemmas, range(len(words))):
+            return " ".join(lemmas)  # type: ignore
         logging.warning(
             f"Text token length of {len(words)} is smaller than the size of "
             f"the context window of {window_size}. The model predition might "
             "be siginficantly worse."
         )
-        result = predict(" ".join(words))[0]
+        result = predict([" ".join(words)])[0]
         return result
     if len(ngrams) == 1:
+        if lexicon and _resolved(lemmas, range(len(words))):
+            return " ".join(lemmas)  # type: ignore
         logging.warning(
             f"Text token length of {len(words)} is just about the size of "
             f"the context window of {window_size}. The model predition might "
             "be siginficantly worse."
         )
-        result = predict(" ".join(ngrams[0]))[0]
+        result = predict([" ".join(ngrams[0])])[0]
         return result
     first, last, target = 0, len(ngrams) - 1, sum(divmod(window_size, 2))
-    for i, ngram in enumerate(ngrams, start=first):
-        pred = predict(" ".join(ngram))[0].split()
+    spans = [
+        _span(i, first, last, target, window_size)
+        for i in range(first, last + 1)
+    ]
+    pending = [
+        i
+        for i, span in enumerate(spans, start=first)
+        if not (lexicon and _resolved(lemmas, span))
+    ]
+    windows = _predict_windows(
+        predict, [" ".join(ngrams[i]) for i in pending], batch_size
+    )
+    predictions = dict(zip(pending, windows))
+    for i, span in enumerate(spans, start=first):
+        if i not in predictions:
+            preds.extend(lemmas[p] for p in span)  # type: ignore
+            continue
+        pred = predictions[i].split()
         if i == first:
             preds.extend(pred[: target + 1])
         elif i == last:
@@ -68,3 +141,35 @@ def _process(
             preds.append(pred[target])
     result = " ".join(preds)
     return result
+
+
+def _predict_windows(
+    predict: Callable[[list[str]], list[str]],
+    windows: list[str],
+    batch_size: int,
+) -> list[str]:
+    """Predict windows in consecutive batches of up to `batch_size`."""
+    if batch_size < 0:
+        raise ValueError(f"invalid batch size: {batch_size}")
+    if batch_size == 0:
+        return predict(windows) if windows else []
+    result: list[str] = []
+    for start in range(0, len(windows), batch_size):
+        result.extend(predict(windows[start : start + batch_size]))
+    return result
+
+
+def _span(
+    i: int, first: int, last: int, target: int, window_size: int
+) -> range:
+    """Return text positions whose lemmas are taken from the i-th window."""
+    positions = range(i, i + window_size)
+    if i == first:
+        return positions[: target + 1]
+    elif i == last:
+        return positions[-target + 1 :]
+    return positions[target : target + 1]
+
+
+def _resolved(lemmas: list[str | None], positions: range) -> bool:
+    return all(lemmas[p] is not None for p in positions)
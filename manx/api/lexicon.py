@@ -0,0 +1,122 @@
+"""Lexicon offers a dictionary lookup of lemmas for unambiguous word forms."""
+
+# Standard library imports
+from __future__ import annotations
+from collections import defaultdict
+from functools import cache
+import os
+
+# Third-party library imports
+import numpy as np
+from numpy import typing as npt
+
+# Local library imports
+from manx.config import settings
+from manx.parsing import DictTable, TagLine
+
+
+__all__ = ["Lexicon"]
+
+
+class Lexicon:
+    """Lexicon maps stripped word forms to their only attested stripped lexel.
+
+    Forms are kept with their total corpus count, so that the lookup can be
+    restricted to forms attested at least `min_count` times.
+    """
+
+    def __init__(
+        self,
+        forms: list[str],
+        lemmas: list[str],
+        counts: npt.NDArray[np.int64],
+        min_count: int = 1,
+    ) -> None:
+        self._forms = forms
+        self._lemmas = lemmas
+        self._counts = counts
+        self.min_count = min_count
+        self._lookup = {
+            f: l
+            for f, l, c in zip(forms, lemmas, counts.tolist())
+            if c >= min_count
+        }
+
+    def __len__(self) -> int:
+        return len(self._lookup)
+
+    def __contains__(self, form: object) -> bool:
+        return form in self._lookup
+
+    def get(self, form: str) -> str | None:
+        return self._lookup.get(form)
+
+    @classmethod
+    def from_table(cls, table: DictTable, min_count: int = 1) -> Lexicon:
+        """Collect forms mapped to a single lexel throughout the dict table.
+
+        Forms and lexels are stripped the same way as in T5 training data.
+        """
+        lexels, grammels, forms = (
+            table.vocabs["lexel"],
+            table.vocabs["grammel"],
+            table.vocabs["form"],
+        )
+        stripped: dict[tuple[int, int, int], tuple[str, str]] = {}
+        counts: defaultdict[str, defaultdict[str, int]] = defaultdict(
+            lambda: defaultdict(int)
+        )
+        for key, count in zip(
+            zip(
+                table.lexel.tolist(),
+                table.grammel.tolist(),
+                table.form.tolist(),
+            ),
+            table.count.tolist(),
+        ):
+            if key not in stripped:
+                line = TagLine(
+                    "$", lexels[key[0]], grammels[key[1]], forms[key[2]]
+                )
+                stripped[key] = (line.stripped_form, line.stripped_lexel)
+            form, lemma = stripped[key]
+            counts[form][lemma] += count
+        entries = sorted(
+            (form, *lemmas.popitem())
+            for form, lemmas in counts.items()
+            if len(lemmas) == 1
+        )
+        return cls(
+            forms=[e[0] for e in entries],
+            lemmas=[e[1] for e in entries],
+            counts=np.array([e[2] for e in entries], dtype=np.int64),
+            min_count=min_count,
+        )
+
+    def save(self, path: str | os.PathLike) -> None:
+        """Save all lexicon entries to an .npz file."""
+        with open(path, "wb") as f:
+            np.savez_compressed(
+                f,
+                forms=np.array(self._forms, dtype=str),
+                lemmas=np.array(self._lemmas, dtype=str),
+                counts=self._counts,
+            )
+
+    @classmethod
+    def load(cls, path: str | os.PathLike, min_count: int = 1) -> Lexicon:
+        with np.load(path) as data:
+            return cls(
+                forms=data["forms"].tolist(),
+                lemmas=data["lemmas"].tolist(),
+                counts=data["counts"],
+                min_count=min_count,
+            )
+
+
+@cache
+def default() -> Lexicon | None:
+    """Lexicon configured in settings loaded with the first invocation."""
+    if not settings.LEXICON_PATH:
+        return None
+    return Lexicon.load(settings.LEXICON_PATH, settings.LEXICON_MIN_COUNT)
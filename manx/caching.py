@@ -0,0 +1,137 @@
+"""Caching keeps model predictions of text windows for reuse."""
+
+# Standard library imports
+from __future__ import annotations
+from collections import OrderedDict
+import os
+import sqlite3
+import threading
+from typing import Any, Iterable, NamedTuple
+
+
+__all__ = ["CacheKey", "PredictionCache"]
+
+
+class CacheKey(NamedTuple):
+    model: str
+    prefix: str
+    window: str
+
+
+class PredictionCache:
+    """PredictionCache is a bounded LRU cache of window predictions.
+
+    The least recently used predictions are evicted once the cache holds
+    more than `max_entries` predictions or more than `max_bytes` bytes of
+    UTF-8 encoded keys and predictions. Zero disables the respective limit,
+    but at least one of them must be set.
+
+    With `path` given, predictions are also stored in an SQLite file. Lookups
+    missing the memory fall back to the file, so predictions outlive the
+    process; the file itself is not bounded.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 0,
+        max_bytes: int = 0,
+        path: str | os.PathLike | None = None,
+    ) -> None:
+        if max_entries < 0 or max_bytes < 0 or not (max_entries or max_bytes):
+            raise ValueError(
+                f"invalid cache limits: {max_entries} entries, "
+                f"{max_bytes} bytes"
+            )
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._entries: OrderedDict[CacheKey, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS predictions ("
+                "model TEXT, prefix TEXT, window TEXT, prediction TEXT, "
+                "PRIMARY KEY (model, prefix, window))"
+            )
+            self._db.commit()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: CacheKey) -> str | None:
+        """Return the cached prediction and mark it as recently used."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            elif self._db is not None:
+                row = self._db.execute(
+                    "SELECT prediction FROM predictions "
+                    "WHERE model = ? AND prefix = ? AND window = ?",
+                    key,
+                ).fetchone()
+                if row is not None:
+                    value = row[0]
+                    self._insert(key, row[0])
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def put(self, key: CacheKey, value: str) -> None:
+        self.update([(key, value)])
+
+    def update(self, items: Iterable[tuple[CacheKey, str]]) -> None:
+        """Cache many predictions, storing them on disk in one commit."""
+        items = list(items)
+        with self._lock:
+            for key, value in items:
+                self._insert(key, value)
+            if self._db is not None and items:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?)",
+                    [(*key, value) for key, value in items],
+                )
+                self._db.commit()
+
+    def stats(self) -> dict[str, Any]:
+        """Return the counters and the size of the cache."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self),
+            "bytes": self.nbytes,
+        }
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _insert(self, key: CacheKey, value: str) -> None:
+        if key in self._entries:
+            self.nbytes -= _size(key, self._entries.pop(key))
+        size = _size(key, value)
+        if self.max_bytes and size > self.max_bytes:
+            return
+        self._entries[key] = value
+        self.nbytes += size
+        while self._full():
+            old, old_value = self._entries.popitem(last=False)
+            self.nbytes -= _size(old, old_value)
+
+    def _full(self) -> bool:
+        if self.max_entries and len(self._entries) > self.max_entries:
+            return True
+        if self.max_bytes and self.nbytes > self.max_bytes:
+            return True
+        return False
+
+
+def _size(key: CacheKey, value: str) -> int:
+    return sum(len(s.encode("utf-8")) for s in (*key, value))
@@ -0,0 +1,142 @@
+"""Compression opens plain and compressed files alike for streaming IO."""
+
+# Standard library imports
+from __future__ import annotations
+import enum
+import gzip
+import io
+import lzma
+import os
+from pathlib import Path
+import sys
+from typing import IO, Any, BinaryIO, cast
+
+
+__all__ = ["Compression", "xopen"]
+
+
+class CompressionError(Exception):
+    ...
+
+
+class Compression(str, enum.Enum):
+    Off = "none"
+    Gzip = "gzip"
+    Zstd = "zstd"
+    Xz = "xz"
+
+
+SUFFIXES = {
+    ".gz": Compression.Gzip,
+    ".zst": Compression.Zstd,
+    ".xz": Compression.Xz,
+}
+
+# NOTE: the defaults of the command-line tools of each codec
+DEFAULT_LEVELS = {
+    Compression.Gzip: 6,
+    Compression.Zstd: 3,
+    Compression.Xz: 6,
+}
+
+
+def detect(path: str | os.PathLike) -> Compression:
+    """Tell the compression of a file from its suffix."""
+    return SUFFIXES.get(Path(path).suffix.lower(), Compression.Off)
+
+
+def strip_suffix(name: str) -> str:
+    """Remove the compression suffix from the file name if there is one."""
+    suffix = Path(name).suffix
+    if suffix.lower() in SUFFIXES:
+        return name[: -len(suffix)]
+    return name
+
+
+def codec(stream: IO[Any]) -> Compression:
+    """Tell the compression of a stream opened with xopen."""
+    stream = getattr(stream, "buffer", stream)
+    if isinstance(stream, gzip.GzipFile):
+        return Compression.Gzip
+    if isinstance(stream, lzma.LZMAFile):
+        return Compression.Xz
+    if type(stream).__module__.split(".")[0] == "zstandard":
+        return Compression.Zstd
+    return Compression.Off
+
+
+def xopen(
+    path: str | os.PathLike,
+    mode: str = "r",
+    compression: Compression | None = None,
+    level: int | None = None,
+    threads: int = 0,
+    encoding: str = "utf-8",
+) -> IO[Any]:
+    """Open a file for streaming reads or writes, compressed or not.
+
+    The compression is told from the file suffix unless `compression` is
+    given. A path of "-" stands for the standard input or output, which is
+    left open when the returned file is closed. The `level` defaults to the
+    command-line default of the codec, and `threads` is only used by zstd,
+    where 0 compresses in the calling thread and -1 uses all CPUs.
+
+    Text mode is the default; add "b" to `mode` for binary files.
+    """
+    binary = "b" in mode
+    raw_mode = mode.replace("t", "").replace("b", "") + "b"
+    if compression is None:
+        compression = Compression.Off if path == "-" else detect(path)
+
+    if compression == Compression.Off and path != "-":
+        if binary:
+            return open(path, raw_mode)
+        return open(path, mode, encoding=encoding)
+
+    target: str | os.PathLike | BinaryIO = path
+    if path == "-":
+        std = sys.stdin if raw_mode == "rb" else sys.stdout
+        std.flush()
+        target = cast(BinaryIO, open(std.fileno(), raw_mode, closefd=False))
+
+    stream = _open(target, raw_mode, compression, level, threads)
+    if binary:
+        return stream
+    return io.TextIOWrapper(stream, encoding=encoding)  # type: ignore
+
+
+def _open(
+    target: str | os.PathLike | BinaryIO,
+    mode: str,
+    compression: Compression,
+    level: int | None,
+    threads: int,
+) -> BinaryIO:
+    writing = mode != "rb"
+    match compression:
+        case Compression.Off if not isinstance(target, (str, os.PathLike)):
+            return target
+        case Compression.Gzip:
+            if level is None:
+                level = DEFAULT_LEVELS[compression]
+            return cast(BinaryIO, gzip.open(target, mode, compresslevel=level))
+        case Compression.Xz:
+            if level is None and writing:
+                level = DEFAULT_LEVELS[compression]
+            return cast(BinaryIO, lzma.open(target, mode, preset=level))
+        case Compression.Zstd:
+            try:
+                import zstandard  # type: ignore
+            except ImportError as e:
+                raise CompressionError(
+                    "zstd compression requires zstandard; "
+                    "install manx[zstd]"
+                ) from e
+            if writing:
+                if level is None:
+                    level = DEFAULT_LEVELS[compression]
+                cctx = zstandard.ZstdCompressor(level=level, threads=threads)
+                return zstandard.open(target, mode, cctx=cctx)
+            return zstandard.open(target, mode)
+        case _:
+            raise CompressionError(f"unsupported compression: {compression}")
@@ -30,15 +30,31 @@ class Settings(BaseSettings):
     T5_PREFIX: str = "Lemmatize"
     DEFAULT_NGRAM_SIZE: int = 11
     DEFAULT_CHUNK_SIZE: int = 200
+    DEFAULT_CONTEXT_SIZE: int = 5
+    DEFAULT_SPLIT: tuple[float, float, float] = (0.8, 0.1, 0.1)
+    DEFAULT_SEED: int = 0
+    DEFAULT_SHARD_ROWS: int = 100_000
+    DEFAULT_SHUFFLE_BUFFER: int = 1000
+    ID_SCHEME: Literal["uuid", "sequence"] = "uuid"
 
     API_HOST: str = "localhost"
     API_PORT: int = 8000
     API_LOG_LEVEL: str = "INFO"
     API_TEXT_PLACEHOLDER: str = TEXT_PLACEHOLDER
+    API_WORKERS: int = 8
+    API_MAX_BATCH_SIZE: int = 32
+    API_MAX_WAIT: float = 0.01
 
     MODEL_TYPE: Literal["byt5", "mt5", "t5"] = "byt5"
     MODEL_DIR: str = "mdm-code/me-lemmatize-byt5-small"
     USE_GPU: bool = False
+    MODEL_BATCH_SIZE: int = 32
+    MODEL_CACHE_ENTRIES: int = 10_000
+    MODEL_CACHE_BYTES: int = 0
+    MODEL_CACHE_PATH: str = ""
+
+    LEXICON_PATH: str = ""
+    LEXICON_MIN_COUNT: int = 5
 
 
 settings = Settings()
@@ -4,10 +4,14 @@
 from __future__ import annotations
 import argparse
 import sys
+from typing import IO, Any
 
 # Local library imports
-from manx import download, Format, load, write, writing, api
+from manx import download, Format, iter_load, load, load_dictionary
+from manx import write, writing
+from manx import api, compression, nlp, sharding, snapshot, write_shards
 from manx.config import settings
+from manx.parsing import POS
 
 
 def get_args() -> argparse.Namespace:
@@ -49,7 +53,38 @@ def get_args() -> argparse.Namespace:
         "-r",
         "--root",
         help="root directory for corpus files",
-        required=(False if "--from-web" in sys.argv[1:] else True),
+        required=not _has_source(),
+    )
+    parse.add_argument(
+        "--snapshot",
+        help="load the corpus from a snapshot file instead",
+        default=None,
+    )
+    parse.add_argument(
+        "--include",
+        help="glob patterns of document labels to parse; all if unset",
+        nargs="+",
+        default=[],
+    )
+    parse.add_argument(
+        "--exclude",
+        help="glob patterns of document labels to skip",
+        nargs="+",
+        default=[],
+    )
+    parse.add_argument(
+        "--min-size",
+        help="skip tag files smaller than this many bytes on disk, "
+        "compressed if the files are",
+        default=0,
+        type=int,
+    )
+    parse.add_argument(
+        "--max-size",
+        help="skip tag files larger than this many bytes on disk, "
+        "compressed if the files are; 0 for no limit",
+        default=0,
+        type=int,
     )
     parse.add_argument(
         "--ngram-size",
@@ -57,12 +92,64 @@ def get_args() -> argparse.Namespace:
         default=settings.DEFAULT_NGRAM_SIZE,
         type=int,
     )
+    parse.add_argument(
+        "--ngram-stride",
+        help="the number of tokens between starts of consecutive T5 ngrams",
+        default=1,
+        type=_positive,
+    )
+    parse.add_argument(
+        "--dedup",
+        help="drop repeated T5 lines; near also matches lines differing in "
+        "case, diacritics and punctuation",
+        choices=[d.value for d in list(writing.Dedup)],
+        default=writing.Dedup.Off.value,
+    )
     parse.add_argument(
         "--chunk-size",
         help="the size of document chunk for T5 CSV",
         default=settings.DEFAULT_CHUNK_SIZE,
         type=int,
     )
+    parse.add_argument(
+        "--shuffle-seed",
+        help="seed of T5 chunk shuffling; chunks are not shuffled if unset",
+        default=None,
+        type=int,
+    )
+    parse.add_argument(
+        "--shuffle-buffer",
+        help="the number of chunks held by the T5 shuffle buffer",
+        default=settings.DEFAULT_SHUFFLE_BUFFER,
+        type=_positive,
+    )
+    parse.add_argument(
+        "--bucket-window",
+        help="the number of T5 lines reordered by length at a time; "
+        "0 keeps the order",
+        default=0,
+        type=int,
+    )
+    parse.add_argument(
+        "--buckets",
+        help="upper byte length bounds of T5 line buckets; lines are "
+        "sorted by length within windows if unset",
+        nargs="+",
+        type=int,
+        default=[],
+    )
+    parse.add_argument(
+        "--bucket-stats",
+        help="CSV output of T5 line counts and lengths per bucket",
+        default=None,
+    )
+    parse.add_argument(
+        "-j",
+        "--workers",
+        help="the number of processes generating T5 lines",
+        default=1,
+        type=int,
+    )
     parse.add_argument(
         "-f",
         "--format",
@@ -70,6 +157,12 @@ def get_args() -> argparse.Namespace:
         choices=[f.value for f in list(writing.Format)],
         default=writing.Format.StripText.value,
     )
+    parse.add_argument(
+        "--id-scheme",
+        help="token and document identifier scheme",
+        choices=[s.value for s in list(nlp.IdScheme)],
+        default=settings.ID_SCHEME,
+    )
     parse.add_argument(
         "-p",
         "--t5prefix",
@@ -78,6 +171,180 @@ def get_args() -> argparse.Namespace:
         dest="prefix",
     )
     parse.add_argument(
+        "-o",
+        "--output",
+        default="-",
+        help="all-round output file; .gz, .zst and .xz files are compressed",
+    )
+    parse.add_argument(
+        "--compress",
+        help="output compression; told from the output suffix if unset",
+        choices=[c.value for c in list(compression.Compression)],
+        default=None,
+    )
+    parse.add_argument(
+        "--compress-level",
+        help="output compression level; the codec default if unset",
+        default=None,
+        type=int,
+    )
+    parse.add_argument(
+        "--compress-threads",
+        help="zstd compression threads; -1 uses all CPUs",
+        default=0,
+        type=int,
+    )
+    parse.add_argument(
+        "-d",
+        "--output-dir",
+        help="directory for sharded train/valid/test T5 output",
+        default=None,
+    )
+    parse.add_argument(
+        "--split",
+        help="train, valid and test ratios of sharded T5 output",
+        nargs=3,
+        type=float,
+        default=list(settings.DEFAULT_SPLIT),
+    )
+    parse.add_argument(
+        "--split-by",
+        help="unit assigned to data splits of sharded T5 output",
+        choices=[s.value for s in list(sharding.SplitBy)],
+        default=sharding.SplitBy.Doc.value,
+    )
+    parse.add_argument(
+        "--seed",
+        help="seed of data split assignment",
+        default=settings.DEFAULT_SEED,
+        type=int,
+    )
+    parse.add_argument(
+        "--shard-rows",
+        help="the maximum number of rows per shard; 0 means no limit",
+        default=settings.DEFAULT_SHARD_ROWS,
+        type=int,
+    )
+    parse.add_argument(
+        "--shard-size",
+        help="the maximum shard size in bytes; 0 means no limit",
+        default=0,
+        type=int,
+    )
+
+    conc = subparsers.add_parser(
+        "concordance",
+        help="list keywords in context",
+        description="Manx-concordance - List LAEME keywords in context",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        parents=[verbose_parser],
+    )
+    conc.add_argument(
+        "--from-web",
+        help="parse files directly from the web",
+        action="store_true",
+    )
+    conc.add_argument(
+        "-r",
+        "--root",
+        help="root directory for corpus files",
+        required=not _has_source(),
+    )
+    conc.add_argument(
+        "--snapshot",
+        help="load the corpus from a snapshot file instead",
+        default=None,
+    )
+    query = conc.add_mutually_exclusive_group(required=True)
+    query.add_argument("--lexel", help="lexel to look up")
+    query.add_argument("--form", help="word form to look up")
+    query.add_argument("--regex", help="pattern searched for in word forms")
+    query.add_argument(
+        "--pos",
+        help="part of speech to look up",
+        choices=[p.name for p in list(POS)],
+    )
+    conc.add_argument(
+        "--left",
+        help="the number of context tokens left of the keyword",
+        default=settings.DEFAULT_CONTEXT_SIZE,
+        type=_non_negative,
+    )
+    conc.add_argument(
+        "--right",
+        help="the number of context tokens right of the keyword",
+        default=settings.DEFAULT_CONTEXT_SIZE,
+        type=_non_negative,
+    )
+    conc.add_argument(
+        "--strip",
+        help="print stripped word forms",
+        action="store_true",
+    )
+    conc.add_argument(
+        "-o",
+        "--output",
+        type=argparse.FileType("w"),
+        default="-",
+        help="all-round output file",
+    )
+
+    stats = subparsers.add_parser(
+        "stats",
+        help="compute corpus statistics",
+        description="Manx-stats - Compute LAEME corpus statistics",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        parents=[verbose_parser],
+    )
+    stats.add_argument(
+        "--from-web",
+        help="parse files directly from the web",
+        action="store_true",
+    )
+    stats.add_argument(
+        "-r",
+        "--root",
+        help="root directory for corpus files",
+        required=not _has_source(),
+    )
+    stats.add_argument(
+        "--snapshot",
+        help="load the corpus from a snapshot file instead",
+        default=None,
+    )
+    stats.add_argument(
+        "-k",
+        "--kind",
+        help="statistics table to compute",
+        choices=["frequency", "documents", "ambiguity", "cooccurrence"],
+        default="frequency",
+    )
+    stats.add_argument(
+        "--field",
+        help="token field to count; use pos for POS distributions",
+        choices=[f.value for f in list(nlp.Field)],
+        default=nlp.Field.StrippedForm.value,
+    )
+    stats.add_argument(
+        "--window",
+        help="the size of the co-occurrence window",
+        default=1,
+        type=int,
+    )
+    stats.add_argument(
+        "--min-count",
+        help="the minimum count of a reported co-occurrence",
+        default=1,
+        type=int,
+    )
+    stats.add_argument(
+        "-f",
+        "--format",
+        help="statistics output format",
+        choices=[f.value for f in list(nlp.TableFormat)],
+        default=nlp.TableFormat.CSV.value,
+    )
+    stats.add_argument(
         "-o",
         "--output",
         type=argparse.FileType("w"),
@@ -85,6 +352,56 @@ def get_args() -> argparse.Namespace:
         help="all-round output file",
     )
 
+    lex = subparsers.add_parser(
+        "lexicon",
+        help="build API lemma lookup table from LAEME dicts",
+        description="Manx-lexicon - Build API lemma lookup table",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        parents=[verbose_parser],
+    )
+    lex.add_argument(
+        "--from-web",
+        help="parse files directly from the web",
+        action="store_true",
+    )
+    lex.add_argument(
+        "-r",
+        "--root",
+        help="root directory for corpus files",
+        required=(False if "--from-web" in sys.argv[1:] else True),
+    )
+    lex.add_argument(
+        "-o",
+        "--output",
+        help="lookup table output file",
+        default=settings.LEXICON_PATH or "lexicon.npz",
+    )
+
+    snap = subparsers.add_parser(
+        "snapshot",
+        help="save parsed corpus as a snapshot",
+        description="Manx-snapshot - Save parsed LAEME as a binary snapshot",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        parents=[verbose_parser],
+    )
+    snap.add_argument(
+        "--from-web",
+        help="parse files directly from the web",
+        action="store_true",
+    )
+    snap.add_argument(
+        "-r",
+        "--root",
+        help="root directory for corpus files",
+        required=(False if "--from-web" in sys.argv[1:] else True),
+    )
+    snap.add_argument(
+        "-o",
+        "--output",
+        help="snapshot output file",
+        default="laeme.snapshot",
+    )
+
     api = subparsers.add_parser(
         "api",
         help="run lemmatization API",
@@ -109,6 +426,97 @@ def get_args() -> argparse.Namespace:
     return result
 
 
+def _has_source() -> bool:
+    """Tell if the corpus comes from the web or a snapshot, not from root."""
+    argv = sys.argv[1:]
+    return "--from-web" in argv or "--snapshot" in argv
+
+
+def _non_negative(value: str) -> int:
+    """Parse a non-negative integer argument."""
+    result = int(value)
+    if result < 0:
+        raise argparse.ArgumentTypeError(f"must not be negative: {value}")
+    return result
+
+
+def _positive(value: str) -> int:
+    """Parse a positive integer argument."""
+    result = int(value)
+    if result < 1:
+        raise argparse.ArgumentTypeError(f"must be positive: {value}")
+    return result
+
+
+def get_output(args: argparse.Namespace) -> IO[Any]:
+    """Open the parse output file, compressed as requested."""
+    if not isinstance(args.output, str):
+        return args.output
+    return compression.xopen(
+        args.output,
+        "w",
+        compression=get_compression(args),
+        level=args.compress_level,
+        threads=args.compress_threads,
+    )
+
+
+def get_compression(args: argparse.Namespace) -> compression.Compression:
+    """Tell the parse output compression from the options or the suffix."""
+    if args.compress:
+        return compression.Compression(args.compress)
+    if not isinstance(args.output, str) or args.output == "-":
+        return compression.Compression.Off
+    return compression.detect(args.output)
+
+
+def get_stats_output(args: argparse.Namespace) -> IO[Any]:
+    """Open the bucket statistics output file."""
+    if not isinstance(args.bucket_stats, str):
+        return args.bucket_stats
+    return open(args.bucket_stats, "w")
+
+
+def get_corpus(args: argparse.Namespace) -> nlp.Corpus:
+    """Load the indexed corpus from corpus files or from a snapshot."""
+    if args.snapshot is not None:
+        return snapshot.Snapshot.open(args.snapshot).corpus()
+    return nlp.Corpus(
+        load(
+            from_web=args.from_web,
+            verbose=args.verbose,
+            root=args.root,
+        )
+    )
+
+
+def get_query(args: argparse.Namespace) -> nlp.Query:
+    """Assemble the concordance query from command-line arguments."""
+    if args.lexel is not None:
+        return nlp.Query(nlp.Field.Lexel, args.lexel)
+    if args.form is not None:
+        return nlp.Query(nlp.Field.Form, args.form)
+    if args.regex is not None:
+        return nlp.Query(nlp.Field.Form, args.regex, regex=True)
+    return nlp.Query(nlp.Field.POS, args.pos)
+
+
+def get_table(args: argparse.Namespace, corpus: nlp.Corpus) -> nlp.Table:
+    """Compute the statistics table requested with command-line arguments."""
+    field = nlp.Field(args.field)
+    match args.kind:
+        case "documents":
+            return nlp.per_document(corpus, field)
+        case "ambiguity":
+            return nlp.ambiguity(corpus)
+        case "cooccurrence":
+            return nlp.cooccurrences(
+                corpus, field, window=args.window, min_count=args.min_count
+            )
+        case _:
+            return nlp.frequencies(corpus, field)
+
+
 def main():
     """Manx - Early Middle English lemmatization pipeline based on LAEME."""
     args = get_args()
@@ -116,20 +524,116 @@ def main():
         case "download":
             download(args.root, args.verbose)
         case "parse":
-            laeme = load(
+            laeme = iter_load(
                 from_web=args.from_web,
                 verbose=args.verbose,
                 root=args.root,
+                id_scheme=nlp.IdScheme(args.id_scheme),
+                snapshot=args.snapshot,
+                include=args.include,
+                exclude=args.exclude,
+                min_size=args.min_size,
+                max_size=args.max_size,
             )
             fmt = Format(args.format)
-            write(
-                docs=laeme,
-                output=args.output,
-                fmt=fmt,
+            dedup = None
+            if fmt in writing.T5_FORMATS and args.dedup != writing.Dedup.Off:
+                dedup = writing.DedupFilter(writing.Dedup(args.dedup))
+            if args.output_dir is not None:
+                if fmt != Format.T5input:
+                    sys.exit("--output-dir is only supported for t5 format")
+                if (
+                    args.bucket_window
+                    or args.buckets
+                    or args.bucket_stats is not None
+                ):
+                    sys.exit(
+                        "--output-dir does not support --bucket-window, "
+                        "--buckets or --bucket-stats"
+                    )
+                write_shards(
+                    docs=laeme,
+                    output_dir=args.output_dir,
+                    ratios=tuple(args.split),
+                    seed=args.seed,
+                    split_by=sharding.SplitBy(args.split_by),
+                    max_rows=args.shard_rows,
+                    max_bytes=args.shard_size,
+                    verbose=args.verbose,
+                    ngram_size=args.ngram_size,
+                    chunk_size=args.chunk_size,
+                    t5prefix=args.prefix,
+                    shuffle_seed=args.shuffle_seed,
+                    shuffle_buffer=args.shuffle_buffer,
+                    workers=args.workers,
+                    ngram_stride=args.ngram_stride,
+                    dedup=dedup,
+                )
+            else:
+                if (
+                    fmt == Format.T5Bytes
+                    and get_compression(args) != compression.Compression.Off
+                ):
+                    sys.exit("t5-bytes output cannot be compressed")
+                stats = None
+                if args.bucket_stats is not None:
+                    stats = writing.BucketStats(args.buckets)
+                with get_output(args) as output:
+                    write(
+                        docs=laeme,
+                        output=output,
+                        fmt=fmt,
+                        verbose=args.verbose,
+                        ngram_size=args.ngram_size,
+                        chunk_size=args.chunk_size,
+                        t5prefix=args.prefix,
+                        shuffle_seed=args.shuffle_seed,
+                        shuffle_buffer=args.shuffle_buffer,
+                        workers=args.workers,
+                        bucket_window=args.bucket_window,
+                        bucket_bounds=args.buckets,
+                        bucket_stats=stats,
+                        ngram_stride=args.ngram_stride,
+                        dedup=dedup,
+                    )
+                if stats is not None:
+                    with get_stats_output(args) as f:
+                        stats.table().dump(f)
+            if dedup is not None:
+                print(
+                    f"dropped {dedup.dropped} of {dedup.rows} T5 lines: "
+                    f"{dedup.exact} exact and {dedup.near} near duplicates",
+                    file=sys.stderr,
+                )
+        case "concordance":
+            laeme = get_corpus(args)
+            lines = nlp.concordance(
+                laeme,
+                get_query(args),
+                left=args.left,
+                right=args.right,
+                strip=args.strip,
+            )
+            for line in lines:
+                args.output.write(f"{line}\n")
+        case "stats":
+            laeme = get_corpus(args)
+            table = get_table(args, laeme)
+            table.dump(args.output, nlp.TableFormat(args.format))
+        case "lexicon":
+            table = load_dictionary(
+                from_web=args.from_web,
+                verbose=args.verbose,
+                root=args.root,
+            )
+            api.Lexicon.from_table(table).save(args.output)
+        case "snapshot":
+            laeme = load(
+                from_web=args.from_web,
                 verbose=args.verbose,
-                ngram_size=args.ngram_size,
-                t5prefix=args.prefix,
+                root=args.root,
             )
+            snapshot.save_snapshot(laeme, args.output)
         case "api":
             api.run(host=args.host, port=args.port)
 
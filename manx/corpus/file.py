@@ -40,6 +40,18 @@ class CorpusFile:
     def text(self) -> str:
         return self.contents.text
 
+    @property
+    def size(self) -> int:
+        """Size of the file in bytes.
+
+        Files on disk are not read to get it, so compressed files give their
+        compressed size. Other files give the size of their UTF-8 text.
+        """
+        size = getattr(self.contents, "size", None)
+        if size is None:
+            return len(self.text.encode("utf-8"))
+        return size
+
     @property
     def stem(self) -> str:
         return self.name.split(".")[0]
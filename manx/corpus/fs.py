@@ -7,13 +7,14 @@ import enum
 from functools import wraps
 import os
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Generator
 
 # Local library imports
 from .file import CorpusFile
+from manx.compression import strip_suffix, xopen
 
 
-__all__ = ["Dir", "DirName", "from_root", "traverse"]
+__all__ = ["Dir", "DirName", "from_root", "iter_files", "traverse"]
 
 
 class DirName(str, enum.Enum):
@@ -70,6 +71,22 @@ class FileContents:
     text: str
 
 
+@dataclass(slots=True, frozen=True)
+class FileReader:
+    """FileReader reads the file contents each time the text is accessed."""
+
+    path: Path
+
+    @property
+    def text(self) -> str:
+        return _read(self.path).text
+
+    @property
+    def size(self) -> int:
+        """Size of the file on disk in bytes."""
+        return self.path.stat().st_size
+
+
 def files(func: Callable[[str], Dir]) -> Callable[[str], list[CorpusFile]]:
     @wraps(func)
     def wrapped(*args: str, **kwargs: str):
@@ -84,17 +101,16 @@ def files(func: Callable[[str], Dir]) -> Callable[[str], list[CorpusFile]]:
 
 @files
 def from_root(root: str) -> Dir:
-    """from_root reconstructs the corpus directory structure in memory."""
+    """from_root reconstructs the corpus directory structure in memory.
+
+    Files compressed with gzip, zstd or xz are decompressed on reading and
+    named without their compression suffix.
+    """
     if not os.path.isdir(root):
         raise ValueError
 
     directory = Dir(root, files=[])
 
-    def _read(fn: os.PathLike) -> FileContents:
-        with open(fn) as f:
-            result = FileContents(text=f.read())
-        return result
-
     for d in filter(
         lambda x: x.is_dir(),
         (Path(os.path.join(root, p)) for p in os.listdir(root)),
@@ -107,11 +123,36 @@ def from_root(root: str) -> Dir:
                     (d.joinpath(p) for p in os.listdir(d)),
                 )
             )
-            corpus_files = [CorpusFile(f.name, _read(f)) for f in files]
+            corpus_files = [
+                CorpusFile(strip_suffix(f.name), _read(f)) for f in files
+            ]
             subdir.files.extend(corpus_files)
     return directory
 
 
+def iter_files(root: str) -> Generator[CorpusFile, None, None]:
+    """iter_files yields corpus files under root without reading them.
+
+    Files are listed in the same order as with `from_root`, but their
+    contents are only read when accessed, so that files can be processed
+    one at a time.
+    """
+    if not os.path.isdir(root):
+        raise ValueError
+    for d in (Path(os.path.join(root, p)) for p in os.listdir(root)):
+        if not d.is_dir() or not DirName.is_valid(d.name):
+            continue
+        for f in (d.joinpath(p) for p in os.listdir(d)):
+            if f.is_file():
+                yield CorpusFile(strip_suffix(f.name), FileReader(f))
+
+
+def _read(fn: os.PathLike) -> FileContents:
+    with xopen(fn) as f:
+        result = FileContents(text=f.read())
+    return result
+
+
 def traverse(node: Dir) -> None:
     """Traverse directory structure creating directories and files."""
     if not os.path.isdir(node.path):
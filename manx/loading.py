@@ -2,16 +2,22 @@
 
 # Standard library imports
 from __future__ import annotations
+from fnmatch import fnmatchcase
+import os
 from pathlib import Path
+from typing import Generator, Iterable, Sequence
 
 # Third-party library imports
 from tqdm import tqdm
 
 # Local library imports
 from manx import corpus, nlp, parsing
+from manx.config import settings
+from manx.corpus.file import CorpusFile
+from manx.snapshot import Snapshot
 
 
-__all__ = ["load"]
+__all__ = ["iter_load", "load", "load_dictionary"]
 
 
 def load(
@@ -19,29 +25,160 @@ def load(
     from_web: bool = False,
     root: str = "",
     verbose: bool = False,
+    id_scheme: nlp.IdScheme = nlp.IdScheme(settings.ID_SCHEME),
+    snapshot: str | os.PathLike | None = None,
+    include: Sequence[str] = (),
+    exclude: Sequence[str] = (),
+    min_size: int = 0,
+    max_size: int = 0,
 ) -> list[nlp.Doc]:
-    """Load LAEME corpus data."""
+    """Load LAEME corpus data.
+
+    With `snapshot` given, Docs are loaded from a snapshot file saved with
+    `snapshot.save_snapshot` instead of being parsed from corpus files. See
+    `iter_load` for selecting documents.
+    """
+    return list(
+        iter_load(
+            from_web=from_web,
+            root=root,
+            verbose=verbose,
+            id_scheme=id_scheme,
+            snapshot=snapshot,
+            include=include,
+            exclude=exclude,
+            min_size=min_size,
+            max_size=max_size,
+        )
+    )
+
+
+def iter_load(
+    *,
+    from_web: bool = False,
+    root: str = "",
+    verbose: bool = False,
+    id_scheme: nlp.IdScheme = nlp.IdScheme(settings.ID_SCHEME),
+    snapshot: str | os.PathLike | None = None,
+    include: Sequence[str] = (),
+    exclude: Sequence[str] = (),
+    min_size: int = 0,
+    max_size: int = 0,
+) -> Generator[nlp.Doc, None, None]:
+    """Yield LAEME corpus Docs one by one as tag files are parsed.
+
+    Corpus files under `root` are read only when their turn comes, so just a
+    single file and its Doc are held at a time. Files downloaded with
+    `from_web` are all kept in memory, though they are still parsed lazily.
+
+    Documents are selected by label with `include` and `exclude` glob
+    patterns and by tag file size in bytes with `min_size` and `max_size`,
+    where 0 means no bound. The selection is made before files are read, so
+    files under `root` are measured on disk, compressed if they are, while
+    downloaded files are measured by their UTF-8 text.
+    Snapshot documents are selected by label only. The root directory and
+    the snapshot are checked right away rather than when the first Doc is
+    asked for.
+    """
+    if snapshot is not None:
+        docs = Snapshot.open(snapshot).docs(id_scheme)
+        return (d for d in docs if _selected(d.label, include, exclude))
+    if not from_web:
+        _check_root(root)
+    return _parse(
+        from_web=from_web,
+        root=root,
+        verbose=verbose,
+        id_scheme=id_scheme,
+        include=include,
+        exclude=exclude,
+        min_size=min_size,
+        max_size=max_size,
+    )
+
+
+def _parse(
+    *,
+    from_web: bool,
+    root: str,
+    verbose: bool,
+    id_scheme: nlp.IdScheme,
+    include: Sequence[str],
+    exclude: Sequence[str],
+    min_size: int,
+    max_size: int,
+) -> Generator[nlp.Doc, None, None]:
     if from_web:
-        downloader = corpus.Downloader()
-        files = downloader.download(verbose)
+        files: Iterable[CorpusFile] = _files(
+            from_web=from_web, root=root, verbose=verbose
+        )
     else:
-        if not root or not Path(root).exists():
-            raise ValueError(f"{root} does not exist!")
-        files = corpus.from_root(root)
-    source_files = [
-        (f.stem, f.as_io()) for f in files if f.type == corpus.FileType.Tags
-    ]
+        files = corpus.iter_files(root)
 
     parser: parsing.TagParser = parsing.TagParser()
-
+    itr = (
+        f
+        for f in files
+        if f.type == corpus.FileType.Tags
+        and _selected(f.stem, include, exclude)
+        and (not min_size or f.size >= min_size)
+        and (not max_size or f.size <= max_size)
+    )
     if verbose:
-        result = [
-            nlp.doc(list(parser.parse(file)), label=label)
-            for label, file in tqdm(source_files, desc="Parsing tag files")
-        ]
-    else:
-        result = [
-            nlp.doc(list(parser.parse(file)), label=label)
-            for label, file in source_files
-        ]
-    return result
+        itr = tqdm(itr, desc="Parsing tag files")
+    for f in itr:
+        yield nlp.doc(
+            list(parser.parse(f.as_io())), label=f.stem, id_scheme=id_scheme
+        )
+
+
+def load_dictionary(
+    *,
+    from_web: bool = False,
+    root: str = "",
+    verbose: bool = False,
+) -> parsing.DictTable:
+    """Load all LAEME dict files into a single columnar table.
+
+    Dict files under `root` are read from its `dicts` directory with
+    `parsing.load_dicts`; other corpus files are not read at all.
+    """
+    parser = parsing.DictParser()
+    if not from_web:
+        _check_root(root)
+        return parsing.load_dicts(
+            Path(root) / corpus.DirName.dicts.value, parser
+        )
+    files = _files(from_web=from_web, root=root, verbose=verbose)
+    source_files = [f for f in files if f.type == corpus.FileType.Dict]
+    itr = (
+        tqdm(source_files, desc="Parsing dict files")
+        if verbose
+        else source_files
+    )
+    return parsing.DictTable.concat(
+        parsing.load_dicts(f.as_io(), parser) for f in itr
+    )
+
+
+def _files(
+    *, from_web: bool, root: str, verbose: bool
+) -> list[CorpusFile]:
+    if from_web:
+        downloader = corpus.Downloader()
+        return downloader.download(verbose)
+    _check_root(root)
+    return corpus.from_root(root)
+
+
+def _selected(
+    label: str, include: Sequence[str], exclude: Sequence[str]
+) -> bool:
+    if include and not any(fnmatchcase(label, p) for p in include):
+        return False
+    return not any(fnmatchcase(label, p) for p in exclude)
+
+
+def _check_root(root: str) -> None:
+    if not root or not Path(root).exists():
+        raise ValueError(f"{root} does not exist!")
@@ -2,35 +2,142 @@
 
 # Standard library imports
 from contextlib import redirect_stdout, redirect_stderr
+import threading
+from typing import Sequence
 
 # Third-party library imports
 with open("/dev/null") as f:
     with redirect_stderr(f), redirect_stdout(f):
         from simplet5 import SimpleT5
+import torch
 
 # Local library imports
+from manx.caching import CacheKey, PredictionCache
 from manx.config import settings
 
 
+# NOTE: the generation parameters used by SimpleT5.predict
+GENERATE_KWARGS = {
+    "num_beams": 2,
+    "max_length": 512,
+    "repetition_penalty": 2.5,
+    "length_penalty": 1.0,
+    "early_stopping": True,
+    "top_p": 0.95,
+    "top_k": 50,
+}
+
+
 class T5:
+    _lock = threading.Lock()
+
     def predict(
         self, text: str, prefix: str = settings.T5_PREFIX
     ) -> list[str]:
         "Generate prediction from T5 model for the given text."
+        key = CacheKey(self.model_id, prefix, text)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return [cached]
         text = prefix + ": " + text
-        return self.model.predict(text)
+        result = self.model.predict(text)
+        if self.cache is not None and result:
+            self.cache.put(key, result[0])
+        return result
+
+    def predict_batch(
+        self,
+        texts: Sequence[str],
+        prefix: str = settings.T5_PREFIX,
+        batch_size: int = settings.MODEL_BATCH_SIZE,
+    ) -> list[str]:
+        """Generate predictions from T5 model for many texts at once.
+
+        Texts are sorted by length and passed to the model in padded batches
+        of `batch_size`, so each batch takes one tokenizer call and one
+        generate loop with little padding. A single prediction per text is
+        returned in the order of `texts`. Cached predictions are reused, and
+        repeated texts are passed to the model only once.
+        """
+        if batch_size < 1:
+            raise ValueError(f"invalid batch size: {batch_size}")
+        cached: dict[str, str] = {}
+        if self.cache is not None:
+            for t in dict.fromkeys(texts):
+                pred = self.cache.get(CacheKey(self.model_id, prefix, t))
+                if pred is not None:
+                    cached[t] = pred
+        missing = [t for t in dict.fromkeys(texts) if t not in cached]
+        inputs = [prefix + ": " + t for t in missing]
+        order = sorted(
+            range(len(inputs)), key=lambda i: len(inputs[i]), reverse=True
+        )
+        for start in range(0, len(order), batch_size):
+            batch = order[start : start + batch_size]
+            preds = self._generate([inputs[i] for i in batch])
+            for i, pred in zip(batch, preds):
+                cached[missing[i]] = pred
+        if self.cache is not None and missing:
+            self.cache.update(
+                (CacheKey(self.model_id, prefix, t), cached[t])
+                for t in missing
+            )
+        return [cached[t] for t in texts]
+
+    def _generate(self, texts: list[str]) -> list[str]:
+        model = self.model
+        encoded = model.tokenizer(
+            texts,
+            padding=True,
+            return_tensors="pt",
+            add_special_tokens=True,
+        ).to(model.device)
+        with torch.inference_mode():
+            generated = model.model.generate(
+                input_ids=encoded["input_ids"],
+                attention_mask=encoded["attention_mask"],
+                **GENERATE_KWARGS,
+            )
+        return model.tokenizer.batch_decode(
+            generated,
+            skip_special_tokens=True,
+            clean_up_tokenization_spaces=True,
+        )
+
+    @property
+    def model_id(self) -> str:
+        """Identifier of the model telling its cached predictions apart."""
+        return f"{settings.MODEL_TYPE}:{settings.MODEL_DIR}"
+
+    @property
+    def cache(self) -> PredictionCache | None:
+        """Prediction cache configured in settings, if any."""
+        if hasattr(self, "_cache"):
+            return self._cache
+        self._cache: PredictionCache | None = None
+        if settings.MODEL_CACHE_ENTRIES or settings.MODEL_CACHE_BYTES:
+            self._cache = PredictionCache(
+                max_entries=settings.MODEL_CACHE_ENTRIES,
+                max_bytes=settings.MODEL_CACHE_BYTES,
+                path=settings.MODEL_CACHE_PATH or None,
+            )
+        return self._cache
 
     @property
     def model(self) -> SimpleT5:
         """Underlying T5 model initialized with the first invokation."""
         if hasattr(self, "_model"):
             return self._model
-        self._model: SimpleT5 = SimpleT5()
-        self._model.load_model(
-            model_type=settings.MODEL_TYPE,
-            model_dir=settings.MODEL_DIR,
-            use_gpu=settings.USE_GPU,
-        )
+        with self._lock:
+            if not hasattr(self, "_model"):
+                model = SimpleT5()
+                model.load_model(
+                    model_type=settings.MODEL_TYPE,
+                    model_dir=settings.MODEL_DIR,
+                    use_gpu=settings.USE_GPU,
+                )
+                self._model: SimpleT5 = model
         return self._model
 
 
@@ -2,6 +2,14 @@
 
 # Local library imports
 from .tokens import *
+from .index import *
+from .kwic import *
+from .stats import *
 
 
-__all__ = tokens.__all__  # type: ignore
+__all__ = (
+    tokens.__all__  # type: ignore
+    + index.__all__  # type: ignore
+    + kwic.__all__  # type: ignore
+    + stats.__all__  # type: ignore
+)
@@ -0,0 +1,264 @@
+"""
+Index contains an indexed corpus container with inverted indexes mapping token
+attributes to the positions of tokens in corpus documents.
+"""
+
+# Standard library imports
+from __future__ import annotations
+from dataclasses import dataclass
+import enum
+import os
+from typing import Any, Generator, Iterable, Iterator
+
+# Third-party library imports
+import numpy as np
+from numpy import typing as npt
+
+# Local library imports
+from .tokens import Doc, pos_matrix, POSMatrix, Token
+
+
+__all__ = ["Column", "Corpus", "Field", "Index"]
+
+
+class CorpusIndexError(Exception):
+    ...
+
+
+class Field(str, enum.Enum):
+    """Field names a token attribute that can be indexed."""
+
+    Lexel = "lexel"
+    StrippedLexel = "stripped_lexel"
+    Grammel = "grammel"
+    Form = "form"
+    StrippedForm = "stripped_form"
+    POS = "pos"
+
+
+@dataclass(frozen=True, slots=True)
+class Column:
+    """Column holds integer-coded values of a field for all corpus tokens."""
+
+    codes: npt.NDArray[np.int32]
+    vocab: list[str]
+
+
+class Index:
+    """Index maps keys of a single field to (doc, position) postings.
+
+    Postings of all keys are kept in a single array sorted by key; `offsets`
+    delimits the postings of each key.
+    """
+
+    def __init__(
+        self,
+        keys: list[str],
+        offsets: npt.NDArray[np.int64],
+        postings: npt.NDArray[np.int32],
+    ) -> None:
+        self._keys = keys
+        self._offsets = offsets
+        self._postings = postings
+        self._lookup = {k: i for i, k in enumerate(keys)}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._lookup
+
+    @property
+    def keys(self) -> list[str]:
+        return self._keys.copy()
+
+    def postings(self, key: str) -> npt.NDArray[np.int32]:
+        """Return (doc, position) postings of the key as an (n, 2) array."""
+        try:
+            i = self._lookup[key]
+        except KeyError:
+            return np.empty((0, 2), dtype=np.int32)
+        return self._postings[self._offsets[i] : self._offsets[i + 1]]
+
+    def count(self, key: str) -> int:
+        if (i := self._lookup.get(key)) is None:
+            return 0
+        return int(self._offsets[i + 1] - self._offsets[i])
+
+    @classmethod
+    def build(
+        cls,
+        column: Column,
+        doc_ids: npt.NDArray[np.int32],
+        positions: npt.NDArray[np.int32],
+    ) -> Index:
+        """Build the index from an integer-coded column."""
+        order = np.argsort(column.codes, kind="stable")
+        counts = np.bincount(column.codes, minlength=len(column.vocab))
+        offsets = np.zeros(len(column.vocab) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        postings = np.stack([doc_ids[order], positions[order]], axis=1)
+        return cls(column.vocab, offsets, postings.astype(np.int32))
+
+
+class Corpus:
+    """Corpus is a container of Docs with lazily built inverted indexes.
+
+    Integer-coded `columns` already at hand, for instance from a snapshot,
+    can be passed to skip encoding them from Doc tokens.
+    """
+
+    def __init__(
+        self,
+        docs: Iterable[Doc],
+        columns: dict[Field, Column] | None = None,
+    ) -> None:
+        self._docs = list(docs)
+        self._columns: dict[Field, Column] = dict(columns) if columns else {}
+        self._indexes: dict[Field, Index] = {}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __iter__(self) -> Iterator[Doc]:
+        return iter(self._docs)
+
+    def __getitem__(self, i: int) -> Doc:
+        return self._docs[i]
+
+    @property
+    def docs(self) -> list[Doc]:
+        return self._docs.copy()
+
+    @property
+    def labels(self) -> list[str]:
+        return [d.label for d in self._docs]
+
+    @property
+    def lengths(self) -> npt.NDArray[np.int64]:
+        return np.fromiter(
+            (len(d) for d in self._docs), dtype=np.int64, count=len(self)
+        )
+
+    @property
+    def starts(self) -> npt.NDArray[np.int64]:
+        """Offsets of the first token of each Doc among all corpus tokens."""
+        result = np.zeros(len(self), dtype=np.int64)
+        np.cumsum(self.lengths[:-1], out=result[1:])
+        return result
+
+    @property
+    def doc_ids(self) -> npt.NDArray[np.int32]:
+        """Doc number of each corpus token."""
+        return np.repeat(
+            np.arange(len(self), dtype=np.int32), self.lengths
+        ).astype(np.int32)
+
+    @property
+    def positions(self) -> npt.NDArray[np.int32]:
+        """Position of each corpus token within its Doc."""
+        lengths = self.lengths
+        total = int(lengths.sum())
+        return (
+            np.arange(total, dtype=np.int64) - np.repeat(self.starts, lengths)
+        ).astype(np.int32)
+
+    def column(self, field: Field) -> Column:
+        """Return integer-coded values of the field for all corpus tokens."""
+        field = Field(field)
+        if field not in self._columns:
+            self._columns[field] = self._encode(field)
+        return self._columns[field]
+
+    def index(self, field: Field) -> Index:
+        """Return the inverted index of the field, building it if needed."""
+        field = Field(field)
+        if field not in self._indexes:
+            self._indexes[field] = Index.build(
+                self.column(field), self.doc_ids, self.positions
+            )
+        return self._indexes[field]
+
+    def postings(
+        self, field: Field, key: str, *, label: str | None = None
+    ) -> npt.NDArray[np.int32]:
+        """Return (doc, position) postings of the key in the field.
+
+        Provide `label` to restrict postings to a single document.
+        """
+        result = self.index(field).postings(key)
+        if label is not None:
+            docs = [i for i, d in enumerate(self._docs) if d.label == label]
+            result = result[np.isin(result[:, 0], docs)]
+        return result
+
+    def tokens(
+        self, field: Field, key: str, *, label: str | None = None
+    ) -> Generator[Token, None, None]:
+        """Yield tokens whose field value equals the key."""
+        for doc, pos in self.postings(field, key, label=label):
+            yield self._docs[doc][int(pos)]  # type: ignore
+
+    def values(self, field: Field, key: str, of: Field) -> list[str]:
+        """Return distinct values of `of` for tokens matching the key.
+
+        For instance, `values(Field.Lexel, "son", of=Field.Form)` gives all
+        forms attested for the lexel `son`.
+        """
+        postings = self.postings(field, key)
+        if len(postings) == 0:
+            return []
+        offsets = self.starts[postings[:, 0]] + postings[:, 1]
+        column = self.column(of)
+        return [column.vocab[c] for c in np.unique(column.codes[offsets])]
+
+    def pos_matrix(self, *, sparse: bool = False) -> POSMatrix:
+        """Return the (n_tokens x n_POS) one-hot POS matrix of the corpus."""
+        return pos_matrix(self._docs, sparse=sparse)
+
+    def save_indexes(self, path: str | os.PathLike) -> None:
+        """Save all indexes built so far to an uncompressed .npz file."""
+        arrays: dict[str, Any] = {
+            "labels": np.array(self.labels, dtype=str),
+            "lengths": self.lengths,
+        }
+        for field, index in self._indexes.items():
+            arrays[f"{field.value}.keys"] = np.array(index._keys, dtype=str)
+            arrays[f"{field.value}.offsets"] = index._offsets
+            arrays[f"{field.value}.postings"] = index._postings
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+
+    def load_indexes(self, path: str | os.PathLike) -> None:
+        """Load indexes saved with `save_indexes` for the same set of Docs."""
+        with np.load(path) as data:
+            if data["labels"].tolist() != self.labels or not np.array_equal(
+                data["lengths"], self.lengths
+            ):
+                raise CorpusIndexError(
+                    f"{path} was saved for a different corpus"
+                )
+            for field in Field:
+                if f"{field.value}.keys" not in data:
+                    continue
+                self._indexes[field] = Index(
+                    data[f"{field.value}.keys"].tolist(),
+                    data[f"{field.value}.offsets"],
+                    data[f"{field.value}.postings"],
+                )
+
+    def _encode(self, field: Field) -> Column:
+        lookup: dict[str, int] = {}
+        values: Iterable[str]
+        if field == Field.POS:
+            values = (t.pos for d in self._docs for t in d._elems)
+        else:
+            values = (
+                getattr(t, field.value) for d in self._docs for t in d._elems
+            )
+        codes = np.fromiter(
+            (lookup.setdefault(v, len(lookup)) for v in values),
+            dtype=np.int32,
+            count=int(self.lengths.sum()),
+        )
+        return Column(codes=codes, vocab=list(lookup.keys()))
@@ -0,0 +1,105 @@
+"""
+Kwic produces keyword-in-context listings over indexed corpus Docs.
+"""
+
+# Standard library imports
+from __future__ import annotations
+from dataclasses import dataclass
+import re
+from typing import Generator
+
+# Third-party library imports
+import numpy as np
+from numpy import typing as npt
+
+# Local library imports
+from .index import Corpus, Field
+
+
+__all__ = ["concordance", "Line", "Query"]
+
+
+@dataclass(frozen=True, slots=True)
+class Query:
+    """Query selects tokens by the value of a single indexed field.
+
+    With `regex` set, `pattern` is searched for in every key of the field
+    index rather than matched exactly.
+    """
+
+    field: Field
+    pattern: str
+    regex: bool = False
+
+    def keys(self, keys: list[str]) -> list[str]:
+        """Return index keys matching the query."""
+        if not self.regex:
+            return [self.pattern]
+        expr = re.compile(self.pattern)
+        return [k for k in keys if expr.search(k)]
+
+
+@dataclass(frozen=True, slots=True)
+class Line:
+    """Line is a single keyword-in-context concordance line."""
+
+    label: str
+    position: int
+    left: str
+    keyword: str
+    right: str
+
+    def __str__(self) -> str:
+        fields = [self.label, str(self.position), self.left, self.keyword]
+        return "\t".join(fields + [self.right])
+
+
+def concordance(
+    corpus: Corpus,
+    query: Query,
+    *,
+    left: int = 5,
+    right: int = 5,
+    strip: bool = False,
+) -> Generator[Line, None, None]:
+    """Yield concordance lines for tokens matching the query.
+
+    Lines come in corpus order and are produced one at a time, so that large
+    result sets never have to be held in memory. The `left` and `right`
+    arguments set the number of context tokens on either side of the keyword.
+    """
+    if left < 0 or right < 0:
+        raise ValueError(f"invalid context size: {left}, {right}")
+    return _lines(corpus, query, left, right, strip)
+
+
+def _lines(
+    corpus: Corpus, query: Query, left: int, right: int, strip: bool
+) -> Generator[Line, None, None]:
+    for doc, pos in _postings(corpus, query):
+        d = corpus[int(doc)]
+        elems = d._elems
+        forms = [
+            t.stripped_form if strip else t.form
+            for t in elems[max(pos - left, 0) : pos + right + 1]
+        ]
+        k = min(pos, left)
+        yield Line(
+            label=d.label,
+            position=int(pos),
+            left=" ".join(forms[:k]),
+            keyword=forms[k],
+            right=" ".join(forms[k + 1 :]),
+        )
+
+
+def _postings(corpus: Corpus, query: Query) -> npt.NDArray[np.int32]:
+    index = corpus.index(query.field)
+    keys = query.keys(index.keys)
+    if len(keys) == 1:
+        return index.postings(keys[0])
+    postings = [index.postings(k) for k in keys]
+    if not postings:
+        return np.empty((0, 2), dtype=np.int32)
+    result = np.concatenate(postings)
+    return result[np.lexsort((result[:, 1], result[:, 0]))]
@@ -0,0 +1,169 @@
+"""
+Stats computes corpus frequency and co-occurrence tables from integer-coded
+Corpus columns.
+"""
+
+# Standard library imports
+from __future__ import annotations
+import csv
+from dataclasses import dataclass
+import enum
+import json
+from typing import Any, Generator, TextIO
+
+# Third-party library imports
+import numpy as np
+from numpy import typing as npt
+
+# Local library imports
+from .index import Corpus, Field
+
+
+__all__ = [
+    "ambiguity",
+    "cooccurrences",
+    "frequencies",
+    "per_document",
+    "Table",
+    "TableFormat",
+]
+
+
+class TableFormat(str, enum.Enum):
+    CSV = "csv"
+    JSON = "json"
+
+
+@dataclass(frozen=True, slots=True)
+class Table:
+    """Table holds equally long named columns of a statistics table."""
+
+    columns: dict[str, npt.NDArray[Any]]
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()), []))
+
+    @property
+    def header(self) -> list[str]:
+        return list(self.columns.keys())
+
+    def rows(self) -> Generator[tuple[Any, ...], None, None]:
+        yield from zip(*(c.tolist() for c in self.columns.values()))
+
+    def dump(
+        self, output: TextIO, fmt: TableFormat = TableFormat.CSV
+    ) -> None:
+        """Write out the table as CSV or as a JSON list of row objects."""
+        match fmt:
+            case TableFormat.CSV:
+                writer = csv.writer(output)
+                writer.writerow(self.header)
+                writer.writerows(self.rows())
+            case TableFormat.JSON:
+                header = self.header
+                json.dump([dict(zip(header, r)) for r in self.rows()], output)
+
+
+def frequencies(corpus: Corpus, field: Field) -> Table:
+    """Count tokens per value of the field, most frequent first."""
+    column = corpus.column(field)
+    counts = np.bincount(column.codes, minlength=len(column.vocab))
+    order = np.argsort(-counts, kind="stable")
+    return Table(
+        {
+            "key": _decode(column.vocab, order),
+            "count": counts[order],
+            "share": counts[order] / max(len(column.codes), 1),
+        }
+    )
+
+
+def per_document(corpus: Corpus, field: Field) -> Table:
+    """Count tokens per document and value of the field."""
+    column = corpus.column(field)
+    width = max(len(column.vocab), 1)
+    combined = corpus.doc_ids.astype(np.int64) * width + column.codes
+    keys, counts = np.unique(combined, return_counts=True)
+    docs, codes = np.divmod(keys, width)
+    labels = np.array(corpus.labels, dtype=object)
+    return Table(
+        {
+            "label": labels[docs],
+            "key": _decode(column.vocab, codes),
+            "count": counts,
+        }
+    )
+
+
+def ambiguity(
+    corpus: Corpus,
+    form: Field = Field.StrippedForm,
+    lemma: Field = Field.StrippedLexel,
+) -> Table:
+    """Count distinct lemmas attested for each form.
+
+    Forms are ordered by the number of distinct lemmas and then by token
+    count. The `rate` column gives the share of form tokens not covered by
+    the most frequent lemma of the form.
+    """
+    forms, lemmas = corpus.column(form), corpus.column(lemma)
+    width = max(len(lemmas.vocab), 1)
+    pairs, pair_counts = np.unique(
+        forms.codes.astype(np.int64) * width + lemmas.codes,
+        return_counts=True,
+    )
+    pair_forms = pairs // width
+    n = len(forms.vocab)
+    n_lemmas = np.bincount(pair_forms, minlength=n)
+    tokens = np.bincount(forms.codes, minlength=n)
+    top = np.zeros(n, dtype=np.int64)
+    np.maximum.at(top, pair_forms, pair_counts)
+    order = np.lexsort((-tokens, -n_lemmas))
+    return Table(
+        {
+            "key": _decode(forms.vocab, order),
+            "lemmas": n_lemmas[order],
+            "count": tokens[order],
+            "rate": 1 - top[order] / np.maximum(tokens[order], 1),
+        }
+    )
+
+
+def cooccurrences(
+    corpus: Corpus, field: Field, window: int = 1, min_count: int = 1
+) -> Table:
+    """Count ordered pairs of field values at most `window` tokens apart.
+
+    Pairs never cross document boundaries. Pairs occurring fewer than
+    `min_count` times are left out.
+    """
+    column = corpus.column(field)
+    codes = column.codes.astype(np.int64)
+    doc_ids = corpus.doc_ids
+    width = max(len(column.vocab), 1)
+    pairs = [
+        (codes[:-k] * width + codes[k:])[doc_ids[:-k] == doc_ids[k:]]
+        for k in range(1, window + 1)
+        if k < len(codes)
+    ]
+    if pairs:
+        keys, counts = np.unique(np.concatenate(pairs), return_counts=True)
+    else:
+        keys = counts = np.empty(0, dtype=np.int64)
+    keep = counts >= min_count
+    keys, counts = keys[keep], counts[keep]
+    order = np.argsort(-counts, kind="stable")
+    first, second = np.divmod(keys[order], width)
+    return Table(
+        {
+            "key": _decode(column.vocab, first),
+            "collocate": _decode(column.vocab, second),
+            "count": counts[order],
+        }
+    )
+
+
+def _decode(
+    vocab: list[str], codes: npt.NDArray[np.integer]
+) -> npt.NDArray[np.object_]:
+    return np.array(vocab, dtype=object)[codes]
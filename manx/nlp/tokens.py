@@ -7,7 +7,17 @@ of natural language processing.
 from __future__ import annotations
 from copy import copy
 from dataclasses import dataclass, field
-from typing import Generic, Text, TypeAlias, TYPE_CHECKING, TypeVar, Protocol
+import enum
+from typing import (
+    Any,
+    Generic,
+    Iterable,
+    Text,
+    TypeAlias,
+    TYPE_CHECKING,
+    TypeVar,
+    Protocol,
+)
 import uuid
 
 # Third-party library imports
@@ -15,17 +25,45 @@ import numpy as np
 from numpy import typing as npt
 
 # Local library imports
+from manx.parsing import POS
+
 if TYPE_CHECKING:
-    from manx.parsing import POS, TagLine
+    from manx.parsing import TagLine
 
 
-__all__ = ["doc", "Doc", "ngrams", "Token", "Span"]
+__all__ = [
+    "doc",
+    "Doc",
+    "IdScheme",
+    "ngrams",
+    "pos_indices",
+    "pos_matrix",
+    "Token",
+    "Span",
+]
 
 
 TokenDict: TypeAlias = dict[str, str | int]
 
 DocDict: TypeAlias = dict[str, str | int | list[TokenDict]]
 
+# NOTE: sparse matrices come from the optional scipy dependency
+POSMatrix: TypeAlias = npt.NDArray[np.uint8] | Any
+
+
+class IdScheme(str, enum.Enum):
+    """IdScheme selects how token and document identifiers are generated.
+
+    `UUID` draws a random UUID for each object and is the default of Docs
+    and Tokens. `Sequence` derives the identifier from the document label and
+    the token sequence number, which is cheap to compute and stable across
+    runs, so it requires labelled documents. The `ID_SCHEME` setting applies
+    to documents loaded from corpus files or snapshots.
+    """
+
+    UUID = "uuid"
+    Sequence = "sequence"
+
 
 @dataclass(slots=True)
 class Token:
@@ -36,6 +74,8 @@ class Token:
     stripped_form: str
     sequence: int
     _pos: POS
+    _label: str = field(default="", repr=False)
+    _id_scheme: IdScheme = field(default=IdScheme.UUID, repr=False)
     _uuid: uuid.UUID = field(init=False, repr=False)
 
     def __len__(self) -> int:
@@ -51,6 +91,8 @@ class Token:
 
     @property
     def id(self) -> str:
+        if self._id_scheme == IdScheme.Sequence:
+            return f"{self._label}:{self.sequence}"
         if not hasattr(self, "_uuid"):
             self._uuid: uuid.UUID = uuid.uuid4()
         return self._uuid.hex
@@ -69,10 +111,16 @@ class Token:
         return result
 
 
-def doc(elems: list[TagLine], label: str | None = None) -> Doc:
+def doc(
+    elems: list[TagLine],
+    label: str | None = None,
+    id_scheme: IdScheme = IdScheme.UUID,
+) -> Doc:
     """Assemble Doc object representing a single LAEME text."""
+    _check_label(label, id_scheme)
     result = Doc(
         label=label,
+        id_scheme=id_scheme,
         elems=[
             Token(
                 lexel=e.lexel,
@@ -82,6 +130,8 @@ def doc(elems: list[TagLine], label: str | None = None) -> Doc:
                 stripped_form=e.stripped_form,
                 sequence=i,
                 _pos=e.pos,
+                _label=label if label else "",
+                _id_scheme=id_scheme,
             )
             for i, e in enumerate(elems, start=0)
         ],
@@ -89,11 +139,24 @@ def doc(elems: list[TagLine], label: str | None = None) -> Doc:
     return result
 
 
+def _check_label(label: str | None, id_scheme: IdScheme) -> None:
+    # NOTE: unlabelled documents would share sequence identifiers
+    if id_scheme == IdScheme.Sequence and not label:
+        raise ValueError("sequence identifiers require a document label")
+
+
 class Doc:
     """Doc object representing a single LAEME text."""
 
-    def __init__(self, elems: list[Token], label: str | None = None) -> None:
+    def __init__(
+        self,
+        elems: list[Token],
+        label: str | None = None,
+        id_scheme: IdScheme = IdScheme.UUID,
+    ) -> None:
+        _check_label(label, id_scheme)
         self._label = label if label else ""
+        self._id_scheme = id_scheme
         self._elems = elems
         self._cur = 0
 
@@ -130,6 +193,8 @@ class Doc:
 
     @property
     def id(self) -> str:
+        if self._id_scheme == IdScheme.Sequence:
+            return self._label
         if not hasattr(self, "_uuid"):
             self._uuid: uuid.UUID = uuid.uuid4()
         return self._uuid.hex
@@ -143,6 +208,18 @@ class Doc:
             [w.stripped_form if strip else w.form for w in self._elems]
         )
 
+    def pos_indices(self) -> npt.NDArray[np.uint8]:
+        """Return POS indices of all Doc tokens as a single vector."""
+        return np.fromiter(
+            (t._pos.value for t in self._elems),
+            dtype=np.uint8,
+            count=len(self._elems),
+        )
+
+    def pos_matrix(self, *, sparse: bool = False) -> POSMatrix:
+        """Return the (n_tokens x n_POS) one-hot POS matrix of the Doc."""
+        return _one_hot(self.pos_indices(), sparse=sparse)
+
     def asdict(self) -> DocDict:
         result: DocDict = {
             "id": self.id,
@@ -153,6 +230,45 @@ class Doc:
         return result
 
 
+def pos_indices(docs: Iterable[Doc]) -> npt.NDArray[np.uint8]:
+    """Return POS indices of all tokens in docs as a single vector."""
+    arrays = [d.pos_indices() for d in docs]
+    if not arrays:
+        return np.empty(0, dtype=np.uint8)
+    return np.concatenate(arrays)
+
+
+def pos_matrix(docs: Iterable[Doc], *, sparse: bool = False) -> POSMatrix:
+    """Return the (n_tokens x n_POS) one-hot POS matrix for docs.
+
+    Rows follow the order of documents and of tokens within each document.
+    With `sparse` set, a `scipy.sparse.csr_matrix` is returned instead of a
+    dense array.
+    """
+    return _one_hot(pos_indices(docs), sparse=sparse)
+
+
+def _one_hot(
+    indices: npt.NDArray[np.uint8], *, sparse: bool = False
+) -> POSMatrix:
+    width = len(POS)
+    if not sparse:
+        return np.eye(width, dtype=np.uint8)[indices]
+    try:
+        from scipy.sparse import csr_matrix  # type: ignore
+    except ImportError as e:
+        raise ImportError("sparse POS matrices require scipy") from e
+    n = len(indices)
+    return csr_matrix(
+        (
+            np.ones(n, dtype=np.uint8),
+            indices.astype(np.int32),
+            np.arange(n + 1, dtype=np.int32),
+        ),
+        shape=(n, width),
+    )
+
+
 T = TypeVar("T", covariant=True)
 
 
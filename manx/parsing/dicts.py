@@ -3,12 +3,23 @@
 # Standard library imports
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Generator, TextIO
+import os
+from pathlib import Path
+from typing import Any, Generator, Iterable, TextIO
+
+# Third-party library imports
+import numpy as np
+from numpy import typing as npt
+
+# Local library imports
+from manx.compression import strip_suffix, xopen
 
 
 __all__ = [
     "DictLine",
     "DictParser",
+    "DictTable",
+    "load_dicts",
 ]
 
 
@@ -16,6 +27,10 @@ DICT_SEP = "|"
 
 N_FIELDS = 5
 
+DICT_FILE_SUFFIX = "_mysql.txt"
+
+DictFields = tuple[int, str, str, str, int]
+
 
 class ParsingError(Exception):
     ...
@@ -39,23 +54,228 @@ class DictParser:
         for line in fp:
             yield self._parse(line)
 
+    def table(self, fp: Iterable[str]) -> DictTable:
+        """Read the whole dict file into a columnar DictTable."""
+        return DictTable.from_fields(self._fields(line) for line in fp)
+
     def _parse(self, line: str) -> DictLine:
+        return DictLine(*self._fields(line))
+
+    def _fields(self, line: str) -> DictFields:
         fields = [f for f in line.strip().split(self.sep) if f]
 
         if (l := len(fields)) != self.n_fields:
             raise ParsingError(f"expected {self.n_fields}; got {l}")
 
-        def _strip(field: str) -> str:
-            return field.strip("'")
-
         try:
-            result = DictLine(
-                text_id=int(fields[0]),
-                lexel=_strip(fields[1]),
-                grammel=_strip(fields[2]),
-                form=_strip(fields[3]),
-                count=int(fields[4]),
+            result = (
+                int(fields[0]),
+                fields[1].strip("'"),
+                fields[2].strip("'"),
+                fields[3].strip("'"),
+                int(fields[4]),
             )
         except (TypeError, ValueError):
             raise ParsingError(f"unable to parse: {line}")
         return result
+
+
+class DictTable:
+    """DictTable holds dict file lines as columns.
+
+    Integer fields are kept as numpy arrays. String fields are dictionary
+    encoded: each column stores integer codes into its own vocabulary.
+    """
+
+    def __init__(
+        self,
+        text_id: npt.NDArray[np.int32],
+        lexel: npt.NDArray[np.int32],
+        grammel: npt.NDArray[np.int32],
+        form: npt.NDArray[np.int32],
+        count: npt.NDArray[np.int32],
+        vocabs: dict[str, list[str]],
+    ) -> None:
+        self.text_id = text_id
+        self.lexel = lexel
+        self.grammel = grammel
+        self.form = form
+        self.count = count
+        self.vocabs = vocabs
+        self._lookups = {
+            name: {v: i for i, v in enumerate(vocab)}
+            for name, vocab in vocabs.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.text_id)
+
+    def __iter__(self) -> Generator[DictLine, None, None]:
+        lexels, grammels, forms = (
+            self.vocabs["lexel"],
+            self.vocabs["grammel"],
+            self.vocabs["form"],
+        )
+        for t, l, g, f, c in zip(
+            self.text_id.tolist(),
+            self.lexel.tolist(),
+            self.grammel.tolist(),
+            self.form.tolist(),
+            self.count.tolist(),
+        ):
+            yield DictLine(t, lexels[l], grammels[g], forms[f], c)
+
+    @classmethod
+    def from_fields(cls, rows: Iterable[DictFields]) -> DictTable:
+        lexels: dict[str, int] = {}
+        grammels: dict[str, int] = {}
+        forms: dict[str, int] = {}
+        text_ids: list[int] = []
+        lexel_codes: list[int] = []
+        grammel_codes: list[int] = []
+        form_codes: list[int] = []
+        counts: list[int] = []
+        for text_id, lexel, grammel, form, count in rows:
+            text_ids.append(text_id)
+            lexel_codes.append(lexels.setdefault(lexel, len(lexels)))
+            grammel_codes.append(grammels.setdefault(grammel, len(grammels)))
+            form_codes.append(forms.setdefault(form, len(forms)))
+            counts.append(count)
+        return cls(
+            text_id=np.array(text_ids, dtype=np.int32),
+            lexel=np.array(lexel_codes, dtype=np.int32),
+            grammel=np.array(grammel_codes, dtype=np.int32),
+            form=np.array(form_codes, dtype=np.int32),
+            count=np.array(counts, dtype=np.int32),
+            vocabs={
+                "lexel": list(lexels),
+                "grammel": list(grammels),
+                "form": list(forms),
+            },
+        )
+
+    @classmethod
+    def concat(cls, tables: Iterable[DictTable]) -> DictTable:
+        """Merge tables re-coding string columns into shared vocabularies."""
+        tables = list(tables)
+        vocabs: dict[str, list[str]] = {}
+        columns: dict[str, list[npt.NDArray[np.int32]]] = {}
+        for name in ("lexel", "grammel", "form"):
+            lookup: dict[str, int] = {}
+            columns[name] = []
+            for t in tables:
+                vocab = t.vocabs[name]
+                mapping = np.array(
+                    [lookup.setdefault(v, len(lookup)) for v in vocab],
+                    dtype=np.int32,
+                )
+                columns[name].append(mapping[getattr(t, name)])
+            vocabs[name] = list(lookup)
+
+        def _concat(arrays: list[npt.NDArray[np.int32]]) -> Any:
+            if not arrays:
+                return np.empty(0, dtype=np.int32)
+            return np.concatenate(arrays)
+
+        return cls(
+            text_id=_concat([t.text_id for t in tables]),
+            lexel=_concat(columns["lexel"]),
+            grammel=_concat(columns["grammel"]),
+            form=_concat(columns["form"]),
+            count=_concat([t.count for t in tables]),
+            vocabs=vocabs,
+        )
+
+    def records(self) -> npt.NDArray[Any]:
+        """Return the table as a numpy structured array."""
+        result = np.empty(
+            len(self),
+            dtype=[
+                ("text_id", np.int32),
+                ("lexel", object),
+                ("grammel", object),
+                ("form", object),
+                ("count", np.int32),
+            ],
+        )
+        result["text_id"] = self.text_id
+        for name in ("lexel", "grammel", "form"):
+            vocab = np.array(self.vocabs[name], dtype=object)
+            result[name] = vocab[getattr(self, name)]
+        result["count"] = self.count
+        return result
+
+    def candidates(self, text_id: int, form: str) -> list[str]:
+        """Return lexels attested for the form in the given text."""
+        if (f := self._lookups["form"].get(form)) is None:
+            return []
+        rows = self._postings("text_form", text_id * self._n_forms + f)
+        return self._decode("lexel", self.lexel[rows])
+
+    def forms(self, lexel: str) -> list[str]:
+        """Return forms attested for the lexel in any text."""
+        if (l := self._lookups["lexel"].get(lexel)) is None:
+            return []
+        rows = self._postings("lexel", l)
+        return self._decode("form", self.form[rows])
+
+    @property
+    def _n_forms(self) -> int:
+        return max(len(self.vocabs["form"]), 1)
+
+    def _postings(self, name: str, key: int) -> npt.NDArray[np.int64]:
+        if not hasattr(self, "_indexes"):
+            self._indexes: dict[
+                str, tuple[npt.NDArray[np.int64], dict[int, slice]]
+            ] = {}
+        if name not in self._indexes:
+            match name:
+                case "text_form":
+                    keys = (
+                        self.text_id.astype(np.int64) * self._n_forms
+                        + self.form
+                    )
+                case _:
+                    keys = self.lexel.astype(np.int64)
+            order = np.argsort(keys, kind="stable")
+            uniq, starts, counts = np.unique(
+                keys[order], return_index=True, return_counts=True
+            )
+            self._indexes[name] = (
+                order,
+                {
+                    k: slice(s, s + c)
+                    for k, s, c in zip(
+                        uniq.tolist(), starts.tolist(), counts.tolist()
+                    )
+                },
+            )
+        order, slices = self._indexes[name]
+        return order[slices.get(key, slice(0, 0))]
+
+    def _decode(self, name: str, codes: npt.NDArray[np.int32]) -> list[str]:
+        vocab = self.vocabs[name]
+        return [vocab[c] for c in dict.fromkeys(codes.tolist())]
+
+
+def load_dicts(
+    source: TextIO | str | os.PathLike, parser: DictParser | None = None
+) -> DictTable:
+    """Load a dict file or a whole `dicts/` directory into a DictTable.
+
+    Within a directory, only the `*_mysql.txt` files are read. Files
+    compressed with gzip, zstd or xz are read transparently.
+    """
+    parser = parser if parser else DictParser()
+    if not isinstance(source, (str, os.PathLike)):
+        return parser.table(source)
+    path = Path(source)
+    if not path.is_dir():
+        with xopen(path) as fp:
+            return parser.table(fp)
+    tables: list[DictTable] = []
+    for p in sorted(path.iterdir()):
+        if p.is_file() and strip_suffix(p.name).endswith(DICT_FILE_SUFFIX):
+            with xopen(p) as fp:
+                tables.append(parser.table(fp))
+    return DictTable.concat(tables)
@@ -0,0 +1,238 @@
+"""Sharding writes T5 training data as train/valid/test shard files."""
+
+# Standard library imports
+from __future__ import annotations
+import csv
+import enum
+import hashlib
+import io
+import json
+import os
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable
+
+# Third-party library imports
+from tqdm import tqdm
+
+# Local library imports
+from manx import nlp
+from manx.config import settings
+from manx.writing import Chunk, chunk, marshall_chunks, shuffle, T5line
+from manx.writing import Dedup, DedupFilter, WriteError
+
+
+__all__ = ["Split", "SplitBy", "write_shards"]
+
+
+MANIFEST_NAME = "manifest.json"
+
+
+class Split(str, enum.Enum):
+    Train = "train"
+    Valid = "valid"
+    Test = "test"
+
+
+class SplitBy(str, enum.Enum):
+    Doc = "doc"
+    Chunk = "chunk"
+
+
+def assign(
+    c: Chunk,
+    ratios: tuple[float, float, float],
+    seed: int = settings.DEFAULT_SEED,
+    by: SplitBy = SplitBy.Doc,
+) -> Split:
+    """Assign the chunk to a data split.
+
+    The split depends only on the seed and on the document label, or the
+    label and the chunk number, so it does not change with corpus order.
+    """
+    key = c.key if by == SplitBy.Doc else f"{c.key}:{c.number}"
+    digest = hashlib.blake2b(f"{seed}:{key}".encode(), digest_size=8)
+    u = int.from_bytes(digest.digest(), "big") / 2**64 * sum(ratios)
+    for split, bound in zip(Split, _cumsum(ratios)):
+        if u < bound:
+            return split
+    return Split.Test
+
+
+class ShardWriter:
+    """ShardWriter writes CSV rows of one split rolling over shard files.
+
+    A new shard file is started once the current one holds `max_rows` rows or
+    `max_bytes` bytes. Zero disables the respective limit.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        split: Split,
+        max_rows: int = 0,
+        max_bytes: int = 0,
+    ) -> None:
+        self.root = root
+        self.split = split
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.shards: list[dict[str, Any]] = []
+        self._file: BinaryIO | None = None
+        self._buffer = io.StringIO()
+        self._writer = csv.DictWriter(
+            self._buffer,
+            fieldnames=list(T5line.__annotations__.keys()),
+            quoting=csv.QUOTE_ALL,
+            escapechar="\\",
+        )
+        self._ids = 0
+
+    def write(self, input: str, target: str, prefix: str) -> None:
+        if self._file is None or self._full():
+            self._roll()
+        self._writer.writerow(
+            {
+                "id": self._ids,
+                "prefix": prefix,
+                "input": input,
+                "target": target,
+            }
+        )
+        self._ids += 1
+        self._emit(rows=1)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _full(self) -> bool:
+        shard = self.shards[-1]
+        if self.max_rows and shard["rows"] >= self.max_rows:
+            return True
+        if self.max_bytes and shard["bytes"] >= self.max_bytes:
+            return True
+        return False
+
+    def _roll(self) -> None:
+        self.close()
+        name = f"{self.split.value}-{len(self.shards):05d}.csv"
+        self._file = open(self.root / name, "wb")
+        self.shards.append(
+            {
+                "split": self.split.value,
+                "file": name,
+                "rows": 0,
+                "bytes": 0,
+                "sha256": hashlib.sha256(),
+            }
+        )
+        self._writer.writeheader()
+        self._emit(rows=0)
+
+    def _emit(self, rows: int) -> None:
+        data = self._buffer.getvalue().encode("utf-8")
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        if self._file is None:
+            raise WriteError(f"no open shard for {self.split.value} split")
+        self._file.write(data)
+        shard = self.shards[-1]
+        shard["rows"] += rows
+        shard["bytes"] += len(data)
+        shard["sha256"].update(data)
+
+
+def write_shards(
+    docs: Iterable[nlp.Doc],
+    output_dir: str | os.PathLike,
+    ratios: tuple[float, float, float] = settings.DEFAULT_SPLIT,
+    seed: int = settings.DEFAULT_SEED,
+    split_by: SplitBy = SplitBy.Doc,
+    max_rows: int = settings.DEFAULT_SHARD_ROWS,
+    max_bytes: int = 0,
+    verbose: bool = False,
+    ngram_size: int = settings.DEFAULT_NGRAM_SIZE,
+    chunk_size: int = settings.DEFAULT_CHUNK_SIZE,
+    t5prefix: str = settings.T5_PREFIX,
+    shuffle_seed: int | None = None,
+    shuffle_buffer: int = settings.DEFAULT_SHUFFLE_BUFFER,
+    workers: int = 1,
+    ngram_stride: int = 1,
+    dedup: DedupFilter | None = None,
+) -> dict[str, Any]:
+    """Write T5 CSV lines into train/valid/test shards in `output_dir`.
+
+    Each split is written to its own sequence of shard files, and a manifest
+    with row counts, sizes and SHA-256 hashes of all shards is stored next to
+    them. The manifest is also returned. With `shuffle_seed` given, chunks
+    are shuffled before they are distributed among shards. See
+    `writing.marshall_chunks` for `workers` and `writing.DedupFilter` for
+    `dedup`.
+    """
+    if len(ratios) != len(Split) or any(r < 0 for r in ratios):
+        raise WriteError(f"invalid split ratios: {ratios}")
+    if sum(ratios) <= 0:
+        raise WriteError(f"invalid split ratios: {ratios}")
+    if ngram_stride < 1:
+        raise WriteError(f"invalid ngram stride: {ngram_stride}")
+    root = Path(output_dir)
+    root.mkdir(parents=True, exist_ok=True)
+    writers = {
+        split: ShardWriter(root, split, max_rows, max_bytes)
+        for split in Split
+    }
+
+    chunks: Iterable[Chunk] = chunk(docs, chunk_size)
+    if shuffle_seed is not None:
+        chunks = shuffle(chunks, shuffle_seed, shuffle_buffer)
+    if verbose:
+        chunks = tqdm(chunks, desc="Writing chunks")
+
+    try:
+        for c, pairs in marshall_chunks(
+            chunks, ngram_size, workers, ngram_stride
+        ):
+            writer = writers[assign(c, ratios, seed, split_by)]
+            for input, target in pairs:
+                if dedup is None or dedup.keep(input, target):
+                    writer.write(input, target, t5prefix)
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    shards = [
+        {**shard, "sha256": shard["sha256"].hexdigest()}
+        for writer in writers.values()
+        for shard in writer.shards
+    ]
+    manifest: dict[str, Any] = {
+        "seed": seed,
+        "ratios": list(ratios),
+        "split_by": split_by.value,
+        "ngram_size": ngram_size,
+        "ngram_stride": ngram_stride,
+        "chunk_size": chunk_size,
+        "prefix": t5prefix,
+        "shuffle_seed": shuffle_seed,
+        "shuffle_buffer": shuffle_buffer,
+        "dedup": dedup.mode.value if dedup is not None else Dedup.Off.value,
+        "dropped": dedup.dropped if dedup is not None else 0,
+        "rows": {
+            split.value: sum(s["rows"] for s in writers[split].shards)
+            for split in Split
+        },
+        "shards": shards,
+    }
+    with open(root / MANIFEST_NAME, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def _cumsum(values: Iterable[float]) -> list[float]:
+    result: list[float] = []
+    total = 0.0
+    for v in values:
+        total += v
+        result.append(total)
+    return result
@@ -0,0 +1,253 @@
+"""Snapshot stores parsed corpora as versioned, memory-mappable binary files."""
+
+# Standard library imports
+from __future__ import annotations
+import os
+import struct
+from typing import Any, Iterable
+import zipfile
+
+# Third-party library imports
+import numpy as np
+from numpy import typing as npt
+
+# Local library imports
+from manx import nlp
+from manx.config import settings
+from manx.parsing import POS
+
+
+__all__ = ["save_snapshot", "Snapshot"]
+
+
+SNAPSHOT_FORMAT = "manx-snapshot"
+
+SNAPSHOT_VERSION = 1
+
+# NOTE: vocabulary strings are stored NUL-terminated in a single UTF-8 blob
+VOCAB_SEP = "\x00"
+
+
+class SnapshotError(Exception):
+    ...
+
+
+def save_snapshot(docs: Iterable[nlp.Doc], path: str | os.PathLike) -> None:
+    """Save docs to a snapshot file.
+
+    The snapshot is an uncompressed .npz archive. Every token field is kept
+    as an array of integer codes into the field vocabulary, next to document
+    labels, lengths and token sequence numbers.
+    """
+    corpus = nlp.Corpus(docs)
+    arrays: dict[str, Any] = {
+        "format": _encode_vocab([SNAPSHOT_FORMAT]),
+        "version": np.array([SNAPSHOT_VERSION], dtype=np.int32),
+        "labels": _encode_vocab(corpus.labels),
+        "lengths": corpus.lengths,
+        "sequence": np.fromiter(
+            (t.sequence for d in corpus for t in d._elems),
+            dtype=np.int32,
+            count=int(corpus.lengths.sum()),
+        ),
+    }
+    for field in nlp.Field:
+        column = corpus.column(field)
+        arrays[f"{field.value}.codes"] = column.codes
+        arrays[f"{field.value}.vocab"] = _encode_vocab(column.vocab)
+    with open(path, "wb") as f:
+        np.savez(f, **arrays)
+
+
+class Snapshot:
+    """Snapshot gives access to the columns of a snapshot file.
+
+    Columns are memory-mapped, so opening a snapshot reads little more than
+    the vocabularies, and processes opening the same file share its pages.
+    Docs are built from the columns only when their tokens are accessed.
+    """
+
+    def __init__(self, arrays: dict[str, npt.NDArray[Any]]) -> None:
+        if _decode_vocab(arrays.get("format")) != [SNAPSHOT_FORMAT]:
+            raise SnapshotError("not a manx snapshot")
+        version = int(arrays["version"][0])
+        if version != SNAPSHOT_VERSION:
+            raise SnapshotError(
+                f"unsupported snapshot version {version}; "
+                f"expected {SNAPSHOT_VERSION}"
+            )
+        self._arrays = arrays
+        self.labels = _decode_vocab(arrays["labels"])
+        self.lengths: npt.NDArray[np.int64] = arrays["lengths"]
+        self.offsets = np.zeros(len(self.lengths) + 1, dtype=np.int64)
+        np.cumsum(self.lengths, out=self.offsets[1:])
+        self._vocabs: dict[nlp.Field, list[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    @classmethod
+    def open(cls, path: str | os.PathLike, mmap: bool = True) -> Snapshot:
+        return cls(load_arrays(path, mmap))
+
+    def column(self, field: nlp.Field) -> nlp.Column:
+        """Return the integer-coded column of the field."""
+        field = nlp.Field(field)
+        return nlp.Column(
+            codes=self._arrays[f"{field.value}.codes"],
+            vocab=self.vocab(field),
+        )
+
+    def vocab(self, field: nlp.Field) -> list[str]:
+        field = nlp.Field(field)
+        if field not in self._vocabs:
+            self._vocabs[field] = _decode_vocab(
+                self._arrays[f"{field.value}.vocab"]
+            )
+        return self._vocabs[field]
+
+    def docs(
+        self, id_scheme: nlp.IdScheme = nlp.IdScheme(settings.ID_SCHEME)
+    ) -> list[nlp.Doc]:
+        """Return lazily built Docs of the snapshot in their saved order."""
+        return [
+            SnapshotDoc(self, i, label, id_scheme)
+            for i, label in enumerate(self.labels)
+        ]
+
+    def corpus(
+        self, id_scheme: nlp.IdScheme = nlp.IdScheme(settings.ID_SCHEME)
+    ) -> nlp.Corpus:
+        """Return a Corpus of the snapshot that reuses its coded columns."""
+        return nlp.Corpus(
+            self.docs(id_scheme),
+            columns={f: self.column(f) for f in nlp.Field},
+        )
+
+    def tokens(
+        self,
+        i: int,
+        id_scheme: nlp.IdScheme = nlp.IdScheme(settings.ID_SCHEME),
+    ) -> list[nlp.Token]:
+        """Build the tokens of the i-th document."""
+        start, end = int(self.offsets[i]), int(self.offsets[i + 1])
+        label = self.labels[i]
+        lexel, stripped_lexel, grammel, form, stripped_form, pos = (
+            self._values(f, start, end)
+            for f in (
+                nlp.Field.Lexel,
+                nlp.Field.StrippedLexel,
+                nlp.Field.Grammel,
+                nlp.Field.Form,
+                nlp.Field.StrippedForm,
+                nlp.Field.POS,
+            )
+        )
+        return [
+            nlp.Token(
+                lexel=l,
+                stripped_lexel=sl,
+                grammel=g,
+                form=f,
+                stripped_form=sf,
+                sequence=n,
+                _pos=POS[p],
+                _label=label,
+                _id_scheme=id_scheme,
+            )
+            for l, sl, g, f, sf, n, p in zip(
+                lexel,
+                stripped_lexel,
+                grammel,
+                form,
+                stripped_form,
+                self._arrays["sequence"][start:end].tolist(),
+                pos,
+            )
+        ]
+
+    def _values(self, field: nlp.Field, start: int, end: int) -> list[str]:
+        vocab = self.vocab(field)
+        codes = self._arrays[f"{field.value}.codes"][start:end]
+        return [vocab[c] for c in codes.tolist()]
+
+
+class SnapshotDoc(nlp.Doc):
+    """SnapshotDoc is a Doc building its tokens on first access."""
+
+    def __init__(
+        self,
+        snapshot: Snapshot,
+        i: int,
+        label: str,
+        id_scheme: nlp.IdScheme = nlp.IdScheme(settings.ID_SCHEME),
+    ) -> None:
+        self._snapshot = snapshot
+        self._i = i
+        self._label = label
+        self._id_scheme = id_scheme
+        self._cur = 0
+
+    def __len__(self) -> int:
+        return int(self._snapshot.lengths[self._i])
+
+    @property
+    def _elems(self) -> list[nlp.Token]:
+        if not hasattr(self, "_tokens"):
+            self._tokens = self._snapshot.tokens(self._i, self._id_scheme)
+        return self._tokens
+
+    @_elems.setter
+    def _elems(self, elems: list[nlp.Token]) -> None:
+        self._tokens = elems
+
+
+def load_arrays(
+    path: str | os.PathLike, mmap: bool = True
+) -> dict[str, npt.NDArray[Any]]:
+    """Load all arrays of an uncompressed .npz archive.
+
+    With `mmap`, arrays are memory-mapped straight from the archive instead
+    of being read into memory.
+    """
+    if not mmap:
+        with np.load(path) as data:
+            return {k: data[k] for k in data.files}
+    result: dict[str, npt.NDArray[Any]] = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as f:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise SnapshotError(f"{info.filename} is compressed")
+            f.seek(info.header_offset)
+            header = f.read(30)
+            name_size, extra_size = struct.unpack("<HH", header[26:30])
+            f.seek(info.header_offset + 30 + name_size + extra_size)
+            if np.lib.format.read_magic(f) == (1, 0):
+                read_header = np.lib.format.read_array_header_1_0
+            else:
+                read_header = np.lib.format.read_array_header_2_0
+            shape, fortran, dtype = read_header(f)
+            name = info.filename.removesuffix(".npy")
+            if not np.prod(shape):
+                result[name] = np.empty(shape, dtype=dtype)
+                continue
+            result[name] = np.memmap(
+                path,
+                dtype=dtype,
+                mode="r",
+                offset=f.tell(),
+                shape=shape,
+                order="F" if fortran else "C",
+            )
+    return result
+
+
+def _encode_vocab(vocab: list[str]) -> npt.NDArray[np.uint8]:
+    data = "".join(v + VOCAB_SEP for v in vocab).encode("utf-8")
+    return np.frombuffer(data, dtype=np.uint8)
+
+
+def _decode_vocab(blob: npt.NDArray[np.uint8] | None) -> list[str]:
+    if blob is None:
+        return []
+    return blob.tobytes().decode("utf-8").split(VOCAB_SEP)[:-1]
@@ -2,20 +2,63 @@
 
 # Standard library imports
 from __future__ import annotations
+import bisect
 import csv
 import enum
+import hashlib
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import cache
+import io
+import itertools
 import json
-from typing import Generator, Text, TextIO, TypedDict
+import os
+import random
+import shutil
+import tempfile
+import unicodedata
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Generator,
+    Iterable,
+    NamedTuple,
+    Sequence,
+    Text,
+    TextIO,
+    TypedDict,
+    TypeVar,
+)
+import zipfile
 
 # Third-party library imports
+import numpy as np
+from numpy import typing as npt
 from tqdm import tqdm
 
 # Local library imports
 from manx import nlp
+from manx.compression import codec, Compression
 from manx.config import settings
+from manx.snapshot import load_arrays
 
 
-__all__ = ["Format", "write"]
+__all__ = ["Format", "load_byte_ids", "write"]
+
+
+PARALLEL_BATCH_SIZE = 64
+
+COLUMNAR_BATCH_ROWS = 1 << 16
+
+BYT5_OFFSET = 3
+
+BYT5_EOS = 1
+
+T = TypeVar("T")
+
+# NOTE: the C string escaper used by json.dumps with ensure_ascii set
+_encode_string = json.encoder.encode_basestring_ascii
 
 
 class WriteError(Exception):
@@ -34,7 +77,38 @@ class Format(str, enum.Enum):
     FullText = "full"
     StripText = "strip"
     JSONLines = "jsonlines"
+    JSONColumns = "jsoncolumns"
     T5input = "t5"
+    Parquet = "parquet"
+    Arrow = "arrow"
+    T5Parquet = "t5-parquet"
+    T5Arrow = "t5-arrow"
+    T5Bytes = "t5-bytes"
+
+
+T5_FORMATS = frozenset(
+    {Format.T5input, Format.T5Parquet, Format.T5Arrow, Format.T5Bytes}
+)
+
+
+class Dedup(str, enum.Enum):
+    Off = "off"
+    Exact = "exact"
+    Near = "near"
+
+
+class Chunk(NamedTuple):
+    """Chunk is a run of consecutive tokens from a single LAEME doc."""
+
+    doc: int
+    label: str
+    number: int
+    tokens: list[nlp.Token]
+
+    @property
+    def key(self) -> str:
+        """Key identifying the source document regardless of its position."""
+        return self.label if self.label else f"#{self.doc}"
 
 
 class T5line(TypedDict):
@@ -45,8 +119,9 @@ class T5line(TypedDict):
 
 
 def marshall_string(
-    docs: list[nlp.Doc], fmt: Format, verbose: bool = False
-) -> Text:
+    docs: Iterable[nlp.Doc], fmt: Format, verbose: bool = False
+) -> Generator[Text, None, None]:
+    """marshall_string yields the string representation of each LAEME doc."""
     if verbose:
         itr = tqdm(docs, desc="Writing documents")
     else:
@@ -54,90 +129,491 @@ def marshall_string(
 
     match fmt:
         case Format.FullText:
-            return "\n".join(d.text(strip=False) for d in itr)
+            yield from (d.text(strip=False) for d in itr)
         case Format.StripText:
-            return "\n".join(d.text(strip=True) for d in itr)
+            yield from (d.text(strip=True) for d in itr)
         case Format.JSONLines:
-            return "\n".join(json.dumps(d.asdict()) for d in itr)
+            yield from (doc_json(d) for d in itr)
+        case Format.JSONColumns:
+            dumps = json_encoder()
+            yield from (dumps(doc_columns(d)) for d in itr)
         case _:
             raise WriteFormatError(
                 f"{fmt.value} formatting is not supported by this function"
             )
 
 
+def doc_json(d: nlp.Doc) -> str:
+    """Serialise the doc to the same JSON as `json.dumps(d.asdict())`.
+
+    Tokens are written straight from their attributes with the C string
+    escaper of the json module instead of building a dict per token.
+    """
+    enc = _encode_string
+    tokens = ", ".join(
+        f'{{"id": {enc(t.id)}, "lexel": {enc(t.lexel)}, '
+        f'"stripped_lexel": {enc(t.stripped_lexel)}, '
+        f'"grammel": {enc(t.grammel)}, "form": {enc(t.form)}, '
+        f'"stripped_form": {enc(t.stripped_form)}, '
+        f'"sequence": {t.sequence:d}, "pos": {enc(t._pos.name)}}}'
+        for t in d._elems
+    )
+    return (
+        f'{{"id": {enc(d.id)}, "label": {enc(d.label)}, '
+        f'"length": {len(d):d}, "tokens": [{tokens}]}}'
+    )
+
+
+def doc_columns(d: nlp.Doc) -> dict[str, Any]:
+    """Return the compact JSON object of the doc with a list per field."""
+    elems = d._elems
+    return {
+        "id": d.id,
+        "label": d.label,
+        "length": len(d),
+        "columns": {
+            "id": [t.id for t in elems],
+            "lexel": [t.lexel for t in elems],
+            "stripped_lexel": [t.stripped_lexel for t in elems],
+            "grammel": [t.grammel for t in elems],
+            "form": [t.form for t in elems],
+            "stripped_form": [t.stripped_form for t in elems],
+            "sequence": [t.sequence for t in elems],
+            "pos": [t._pos.name for t in elems],
+        },
+    }
+
+
+@cache
+def json_encoder() -> Callable[[Any], str]:
+    """Return a compact JSON encoder, backed by orjson when it is installed.
+
+    Both encoders give the same output: no whitespace and non-ASCII
+    characters written as they are.
+    """
+    try:
+        import orjson  # type: ignore
+    except ImportError:
+        return _compact_json
+    return lambda obj: orjson.dumps(obj).decode("utf-8")
+
+
+def _compact_json(obj: Any) -> str:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
 def marshall_csv(
-    docs: list[nlp.Doc],
+    docs: Iterable[nlp.Doc],
     verbose: bool = False,
     ngram_size: int = settings.DEFAULT_NGRAM_SIZE,
     chunk_size: int = settings.DEFAULT_CHUNK_SIZE,
     t5prefix: str = settings.T5_PREFIX,
-) -> list[T5line]:
+    shuffle_seed: int | None = None,
+    shuffle_buffer: int = settings.DEFAULT_SHUFFLE_BUFFER,
+    workers: int = 1,
+    bucket_window: int = 0,
+    bucket_bounds: Sequence[int] = (),
+    bucket_stats: BucketStats | None = None,
+    ngram_stride: int = 1,
+    dedup: DedupFilter | None = None,
+) -> Generator[T5line, None, None]:
     """marshall_csv splits LAEME docs into CSV input lines for T5 training.
 
     The function attribute `chunk_size` sets the size of a single chunk
     obtained from a LAEME document.
 
     This function first (1) splits individual LAEME documents into chunks and
-    (2) shuffles the chunks.
+    (2) shuffles the chunks when `shuffle_seed` is given. Lines are yielded
+    one at a time as chunks are produced; see `shuffle` for the memory bound.
+
+    With `workers` greater than one, ngram lines are generated in worker
+    processes. Results are merged back in chunk order, so the output is the
+    same as in serial mode.
+
+    With `bucket_window` set, lines are reordered by length within windows of
+    that many lines; see `order_by_length`. Lines repeated in the stream are
+    dropped by `dedup` when given. Line ids follow the output order.
     """
-    result: list[T5line] = []
+    chunks: Iterable[Chunk] = chunk(docs, chunk_size)
+    if shuffle_seed is not None:
+        chunks = shuffle(chunks, shuffle_seed, shuffle_buffer)
 
-    chunks = [
-        d[i : i + chunk_size]
-        for d in docs
-        for i in range(0, len(d), chunk_size)
-    ]
+    if verbose:
+        chunks = tqdm(chunks, desc="Writing chunks")
+
+    pairs: Iterable[tuple[str, str]] = (
+        pair
+        for _, chunk_pairs in marshall_chunks(
+            chunks, ngram_size, workers, ngram_stride
+        )
+        for pair in chunk_pairs
+    )
+    if dedup is not None:
+        pairs = dedup(pairs)
+    if bucket_window > 0 or bucket_stats is not None:
+        pairs = order_by_length(
+            pairs, bucket_window, bucket_bounds, bucket_stats
+        )
+
+    for idx, (input, target) in enumerate(pairs):
+        yield {
+            "id": idx,
+            "prefix": t5prefix,
+            "input": input,
+            "target": target,
+        }
+
+
+class BucketStats:
+    """BucketStats counts T5 lines and their byte lengths per length bucket.
+
+    Bucket `i` holds lines no longer than `bounds[i]` bytes and longer than
+    the previous bound; the last bucket takes all lines past the last bound.
+    """
 
-    def counter(start: int = 0, step: int = 1) -> Generator[int, None, None]:
-        while True:
-            yield start
-            start += step
+    def __init__(self, bounds: Sequence[int] = ()) -> None:
+        self.bounds = sorted(bounds)
+        n = len(self.bounds) + 1
+        self.rows = np.zeros(n, dtype=np.int64)
+        self.bytes = np.zeros(n, dtype=np.int64)
+        self.min = np.full(n, np.iinfo(np.int64).max, dtype=np.int64)
+        self.max = np.zeros(n, dtype=np.int64)
+
+    def bucket(self, length: int) -> int:
+        return bisect.bisect_left(self.bounds, length)
+
+    def add(self, length: int) -> int:
+        """Count a line of the given length and return its bucket."""
+        b = self.bucket(length)
+        self.rows[b] += 1
+        self.bytes[b] += length
+        self.min[b] = min(self.min[b], length)
+        self.max[b] = max(self.max[b], length)
+        return b
+
+    def table(self) -> nlp.Table:
+        """Tabulate lines per bucket, skipping empty buckets.
+
+        The `padding` column gives the share of pad bytes when all lines of
+        the bucket are padded to its longest line.
+        """
+        keep = self.rows > 0
+        rows, total = self.rows[keep], self.bytes[keep]
+        longest = self.max[keep]
+        bounds = np.array(self.bounds + [-1], dtype=np.int64)
+        return nlp.Table(
+            {
+                "bucket": np.flatnonzero(keep),
+                "bound": bounds[keep],
+                "rows": rows,
+                "min_length": self.min[keep],
+                "max_length": longest,
+                "mean_length": total / rows,
+                "padding": 1 - total / (rows * np.maximum(longest, 1)),
+            }
+        )
+
+
+def order_by_length(
+    pairs: Iterable[tuple[str, str]],
+    window: int,
+    bounds: Sequence[int] = (),
+    stats: BucketStats | None = None,
+) -> Generator[tuple[str, str], None, None]:
+    """Reorder (input, target) pairs by byte length within windows.
+
+    Length is the UTF-8 byte length of input and target together. Without
+    `bounds`, each window of `window` pairs is sorted by length. With
+    `bounds`, pairs of a window are grouped by length bucket, keeping their
+    order within a bucket, so a shuffled order survives. A zero `window`
+    leaves the order as is. Each pair is counted in `stats` when given.
+    """
+    stats = stats if stats is not None else BucketStats(bounds)
+    if window <= 0:
+        for input, target in pairs:
+            stats.add(len(input.encode()) + len(target.encode()))
+            yield input, target
+        return
+
+    for batch in _batched(pairs, window):
+        keys: list[int] = []
+        for input, target in batch:
+            length = len(input.encode()) + len(target.encode())
+            bucket = stats.add(length)
+            keys.append(bucket if bounds else length)
+        order = sorted(range(len(batch)), key=keys.__getitem__)
+        yield from (batch[i] for i in order)
+
+
+class DedupFilter:
+    """DedupFilter drops (input, target) pairs already seen in a stream.
+
+    Pairs are remembered by 8-byte hashes, so memory grows with the number
+    of distinct pairs but not with their length. In `Dedup.Near` mode, pairs
+    that only differ in case, diacritics, punctuation or spacing are also
+    treated as duplicates.
+    """
 
-    idx = counter()
+    def __init__(self, mode: Dedup = Dedup.Exact) -> None:
+        self.mode = mode
+        self.rows = 0
+        self.exact = 0
+        self.near = 0
+        self._seen: set[bytes] = set()
+        self._normalized: set[bytes] = set()
+
+    @property
+    def dropped(self) -> int:
+        return self.exact + self.near
+
+    def __call__(
+        self, pairs: Iterable[tuple[str, str]]
+    ) -> Generator[tuple[str, str], None, None]:
+        for input, target in pairs:
+            if self.keep(input, target):
+                yield input, target
+
+    def keep(self, input: str, target: str) -> bool:
+        """Count the pair and tell if it was not seen before."""
+        self.rows += 1
+        if self.mode == Dedup.Off:
+            return True
+        key = _digest(input, target)
+        if key in self._seen:
+            self.exact += 1
+            return False
+        self._seen.add(key)
+        if self.mode == Dedup.Near:
+            key = _digest(_normalize(input), _normalize(target))
+            if key in self._normalized:
+                self.near += 1
+                return False
+            self._normalized.add(key)
+        return True
+
+
+def _digest(input: str, target: str) -> bytes:
+    data = f"{input}\x00{target}".encode("utf-8")
+    return hashlib.blake2b(data, digest_size=8).digest()
+
+
+def _normalize(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return " ".join(
+        "".join(c for c in word if c.isalnum())
+        for word in decomposed.split()
+    )
+
+
+def chunk(
+    docs: Iterable[nlp.Doc], chunk_size: int = settings.DEFAULT_CHUNK_SIZE
+) -> Generator[Chunk, None, None]:
+    """Split LAEME docs into consecutive chunks of `chunk_size` tokens."""
+    for i, d in enumerate(docs):
+        tokens = d.tokens
+        for n, start in enumerate(range(0, len(tokens), chunk_size)):
+            yield Chunk(
+                doc=i,
+                label=d.label,
+                number=n,
+                tokens=tokens[start : start + chunk_size],
+            )
 
-    if verbose:
-        chunks = tqdm(chunks, desc=f"Writing {len(chunks)} chunks")
-
-    for chunk in chunks:
-        ngrams = nlp.ngrams(chunk, n=ngram_size)
-
-        for ngram in ngrams:
-            input = " ".join(tkn.stripped_form for tkn in ngram)
-            target = " ".join(tkn.stripped_lexel for tkn in ngram)
-            result.append(
-                {
-                    "id": next(idx),
-                    "prefix": t5prefix,
-                    "input": input,
-                    "target": target,
-                }
+
+def shuffle(
+    chunks: Iterable[Chunk],
+    seed: int,
+    buffer_size: int = settings.DEFAULT_SHUFFLE_BUFFER,
+) -> Generator[Chunk, None, None]:
+    """Shuffle chunks with a seeded shuffle buffer.
+
+    At most `buffer_size` chunks are held at a time: once the buffer is full,
+    each incoming chunk replaces a randomly drawn one that is yielded. The
+    same seed and buffer size always give the same order.
+    """
+    if buffer_size < 1:
+        raise WriteError(f"invalid shuffle buffer size: {buffer_size}")
+    return _shuffled(chunks, random.Random(seed), buffer_size)
+
+
+def _shuffled(
+    chunks: Iterable[Chunk], rng: random.Random, buffer_size: int
+) -> Generator[Chunk, None, None]:
+    buffer: list[Chunk] = []
+    for c in chunks:
+        if len(buffer) < buffer_size:
+            buffer.append(c)
+            continue
+        i = rng.randrange(buffer_size)
+        yield buffer[i]
+        buffer[i] = c
+    rng.shuffle(buffer)
+    yield from buffer
+
+
+def marshall_chunk(
+    c: Chunk,
+    ngram_size: int = settings.DEFAULT_NGRAM_SIZE,
+    ngram_stride: int = 1,
+) -> Generator[tuple[str, str], None, None]:
+    """Yield (input, target) string pairs for ngrams of the chunk.
+
+    Ngrams start every `ngram_stride` tokens. The last ngram of the chunk is
+    always included, so with a stride no larger than `ngram_size` every token
+    is still covered by some ngram.
+    """
+    _check_stride(ngram_stride)
+    return _ngram_pairs(
+        [tkn.stripped_form for tkn in c.tokens],
+        [tkn.stripped_lexel for tkn in c.tokens],
+        ngram_size,
+        ngram_stride,
+    )
+
+
+def _check_stride(ngram_stride: int) -> None:
+    if ngram_stride < 1:
+        raise WriteError(f"invalid ngram stride: {ngram_stride}")
+
+
+def _ngram_pairs(
+    forms: list[str], lexels: list[str], ngram_size: int, ngram_stride: int = 1
+) -> Generator[tuple[str, str], None, None]:
+    if ngram_size < 1:
+        return
+    last = len(forms) - ngram_size
+    starts = list(range(0, last + 1, ngram_stride))
+    if starts and starts[-1] != last:
+        starts.append(last)
+    for i in starts:
+        yield (
+            " ".join(forms[i : i + ngram_size]),
+            " ".join(lexels[i : i + ngram_size]),
+        )
+
+
+def marshall_chunks(
+    chunks: Iterable[Chunk],
+    ngram_size: int = settings.DEFAULT_NGRAM_SIZE,
+    workers: int = 1,
+    ngram_stride: int = 1,
+) -> Generator[tuple[Chunk, list[tuple[str, str]]], None, None]:
+    """Yield each chunk with its (input, target) ngram pairs in chunk order.
+
+    With `workers` greater than one, pairs are generated for batches of
+    chunks in worker processes. Only stripped forms and lexels are sent to
+    workers, and at most two batches per worker are in flight at a time to
+    keep memory bounded.
+    """
+    _check_stride(ngram_stride)
+    return _marshall_chunks(chunks, ngram_size, workers, ngram_stride)
+
+
+def _marshall_chunks(
+    chunks: Iterable[Chunk],
+    ngram_size: int,
+    workers: int,
+    ngram_stride: int,
+) -> Generator[tuple[Chunk, list[tuple[str, str]]], None, None]:
+    if workers <= 1:
+        for c in chunks:
+            yield c, list(marshall_chunk(c, ngram_size, ngram_stride))
+        return
+
+    pending: deque[tuple[list[Chunk], Future[list[list[tuple[str, str]]]]]]
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for batch in _batched(chunks, PARALLEL_BATCH_SIZE):
+            columns = [
+                (
+                    [tkn.stripped_form for tkn in c.tokens],
+                    [tkn.stripped_lexel for tkn in c.tokens],
+                )
+                for c in batch
+            ]
+            future = executor.submit(
+                _marshall_batch, columns, ngram_size, ngram_stride
             )
+            pending.append((batch, future))
+            if len(pending) >= 2 * workers:
+                batch, future = pending.popleft()
+                yield from zip(batch, future.result())
+        while pending:
+            batch, future = pending.popleft()
+            yield from zip(batch, future.result())
+
+
+def _marshall_batch(
+    columns: list[tuple[list[str], list[str]]],
+    ngram_size: int,
+    ngram_stride: int = 1,
+) -> list[list[tuple[str, str]]]:
+    return [
+        list(_ngram_pairs(forms, lexels, ngram_size, ngram_stride))
+        for forms, lexels in columns
+    ]
+
 
-    return result
+def _batched(items: Iterable[T], n: int) -> Generator[list[T], None, None]:
+    itr = iter(items)
+    while batch := list(itertools.islice(itr, n)):
+        yield batch
 
 
 def write(
-    docs: list[nlp.Doc],
+    docs: Iterable[nlp.Doc],
     output: TextIO,
     fmt: Format = Format.StripText,
     verbose: bool = True,
     ngram_size: int = settings.DEFAULT_NGRAM_SIZE,
     chunk_size: int = settings.DEFAULT_CHUNK_SIZE,
     t5prefix: str = settings.T5_PREFIX,
+    shuffle_seed: int | None = None,
+    shuffle_buffer: int = settings.DEFAULT_SHUFFLE_BUFFER,
+    workers: int = 1,
+    bucket_window: int = 0,
+    bucket_bounds: Sequence[int] = (),
+    bucket_stats: BucketStats | None = None,
+    ngram_stride: int = 1,
+    dedup: DedupFilter | None = None,
 ) -> None:
     """Write out corpus contents to target file in a given format.
 
-    Specify `output` for a single output. Otherwise, for T5 output, provide
-    file buffers as `train`, `valid`, `test` arguments.
+    All contents go to the single `output`. To split T5 output into train,
+    valid and test shard files, use `sharding.write_shards` instead.
+
+    Documents, or T5 lines, are written out one by one as they are produced,
+    so that the output is never assembled in memory as a whole.
     """
+
+    def _lines() -> Generator[T5line, None, None]:
+        return marshall_csv(
+            docs,
+            verbose,
+            ngram_size,
+            chunk_size,
+            t5prefix,
+            shuffle_seed,
+            shuffle_buffer,
+            workers,
+            bucket_window,
+            bucket_bounds,
+            bucket_stats,
+            ngram_stride,
+            dedup,
+        )
+
     match fmt:
-        case Format.FullText | Format.StripText | Format.JSONLines:
-            output_str = marshall_string(docs, fmt, verbose)
-            output.write(output_str)
-        case Format.T5input:
-            result = marshall_csv(
-                docs, verbose, ngram_size, chunk_size, t5prefix
+        case (
+            Format.FullText
+            | Format.StripText
+            | Format.JSONLines
+            | Format.JSONColumns
+        ):
+            output.writelines(
+                _separated(marshall_string(docs, fmt, verbose), sep="\n")
             )
+        case Format.T5input:
             fields = list(T5line.__annotations__.keys())
             writer = csv.DictWriter(
                 output,
@@ -146,6 +622,303 @@ def write(
                 escapechar="\\",
             )
             writer.writeheader()
-            writer.writerows(result)
+            writer.writerows(_lines())
+        case Format.Parquet | Format.Arrow:
+            write_columnar(
+                marshall_columnar(docs, verbose),
+                _binary(output),
+                fmt,
+                token_schema(),
+            )
+        case Format.T5Parquet | Format.T5Arrow:
+            write_columnar(
+                _t5_batches(_lines()), _binary(output), fmt, t5_schema()
+            )
+        case Format.T5Bytes:
+            if codec(output) != Compression.Off:
+                raise OutputError(
+                    f"{fmt.value} output cannot be compressed, as its "
+                    "arrays are memory-mapped from the archive"
+                )
+            write_byte_ids(_lines(), _binary(output))
         case _:
             raise WriteFormatError(f"{fmt.value} formatting is not supported")
+
+
+def marshall_columnar(
+    docs: Iterable[nlp.Doc], verbose: bool = False
+) -> Generator[Any, None, None]:
+    """marshall_columnar yields Arrow record batches of corpus tokens.
+
+    Tokens of consecutive documents are gathered until a batch holds at least
+    `COLUMNAR_BATCH_ROWS` rows. Label, lexel, grammel and POS columns are
+    dictionary encoded.
+    """
+    pa = _pyarrow()
+    if verbose:
+        itr = tqdm(docs, desc="Writing documents")
+    else:
+        itr = docs
+
+    fields = TOKEN_COLUMNS
+    columns: dict[str, list[Any]] = {f: [] for f in fields}
+
+    def _batch() -> Any:
+        arrays = [
+            pa.array(columns[f], type=t).dictionary_encode()
+            if f in DICTIONARY_COLUMNS
+            else pa.array(columns[f], type=t)
+            for f, t in _token_types(pa).items()
+        ]
+        for values in columns.values():
+            values.clear()
+        return pa.RecordBatch.from_arrays(arrays, schema=token_schema())
+
+    for d in itr:
+        label = d.label
+        for t in d._elems:
+            columns["label"].append(label)
+            columns["id"].append(t.id)
+            columns["sequence"].append(t.sequence)
+            columns["lexel"].append(t.lexel)
+            columns["stripped_lexel"].append(t.stripped_lexel)
+            columns["grammel"].append(t.grammel)
+            columns["form"].append(t.form)
+            columns["stripped_form"].append(t.stripped_form)
+            columns["pos"].append(t.pos)
+        if len(columns["id"]) >= COLUMNAR_BATCH_ROWS:
+            yield _batch()
+    if columns["id"]:
+        yield _batch()
+
+
+TOKEN_COLUMNS = [
+    "label",
+    "id",
+    "sequence",
+    "lexel",
+    "stripped_lexel",
+    "grammel",
+    "form",
+    "stripped_form",
+    "pos",
+]
+
+DICTIONARY_COLUMNS = {
+    "label",
+    "lexel",
+    "stripped_lexel",
+    "grammel",
+    "pos",
+    "prefix",
+}
+
+
+def token_schema() -> Any:
+    """Arrow schema of token-level columnar exports."""
+    pa = _pyarrow()
+    return pa.schema(
+        [
+            pa.field(f, pa.dictionary(pa.int32(), t))
+            if f in DICTIONARY_COLUMNS
+            else pa.field(f, t)
+            for f, t in _token_types(pa).items()
+        ]
+    )
+
+
+def t5_schema() -> Any:
+    """Arrow schema of T5 line columnar exports."""
+    pa = _pyarrow()
+    return pa.schema(
+        [
+            pa.field("id", pa.int64()),
+            pa.field("prefix", pa.dictionary(pa.int32(), pa.string())),
+            pa.field("input", pa.string()),
+            pa.field("target", pa.string()),
+        ]
+    )
+
+
+def write_columnar(
+    batches: Iterable[Any], output: BinaryIO, fmt: Format, schema: Any
+) -> None:
+    """Write Arrow record batches to Parquet or Arrow IPC stream output.
+
+    Each batch is written out as soon as it is produced; for Parquet, every
+    batch becomes a separate row group. The writer is opened with `schema`
+    up front, so that output without any batches is still a valid file.
+    """
+    pa = _pyarrow()
+    match fmt:
+        case Format.Parquet | Format.T5Parquet:
+            from pyarrow import parquet as pq  # type: ignore
+
+            writer = pq.ParquetWriter(output, schema)
+        case Format.Arrow | Format.T5Arrow:
+            writer = pa.ipc.new_stream(output, schema)
+        case _:
+            raise WriteFormatError(f"{fmt.value} is not a columnar format")
+    with writer:
+        for batch in batches:
+            if fmt in (Format.Parquet, Format.T5Parquet):
+                writer.write_table(pa.Table.from_batches([batch]))
+            else:
+                writer.write_batch(batch)
+
+
+def byt5_ids(
+    texts: list[str],
+) -> tuple[npt.NDArray[np.uint16], npt.NDArray[np.int64]]:
+    """Encode texts into flat ByT5 token ids and per-text lengths.
+
+    ByT5 ids are UTF-8 bytes shifted by `BYT5_OFFSET`; every sequence ends
+    with `BYT5_EOS` as it does with the ByT5 tokenizer.
+    """
+    # NOTE: 0xFF never occurs in UTF-8, so it can mark the sequence ends.
+    encoded = [t.encode("utf-8") for t in texts]
+    raw = np.frombuffer(b"\xff".join(encoded) + b"\xff", dtype=np.uint8)
+    ids = raw.astype(np.uint16) + BYT5_OFFSET
+    ids[raw == 0xFF] = BYT5_EOS
+    if not texts:
+        ids = ids[:0]
+    lengths = np.fromiter(
+        (len(e) + 1 for e in encoded), dtype=np.int64, count=len(encoded)
+    )
+    return ids, lengths
+
+
+def write_byte_ids(lines: Iterable[T5line], output: BinaryIO) -> None:
+    """Write T5 lines as ByT5 token ids in an uncompressed .npz archive.
+
+    Inputs are prefixed the same way as in `model.T5.predict`. The archive
+    holds flat `input_ids` and `target_ids`, their row `*_offsets` (one more
+    than the number of rows) and `*_lengths`, and the `ids` of the rows.
+    Token ids are spooled to temporary files while rows are produced, so
+    only the per-row lengths are kept in memory. See `load_byte_ids`.
+    """
+    lengths: dict[str, list[npt.NDArray[np.int64]]] = {
+        "input": [],
+        "target": [],
+    }
+    row_ids: list[npt.NDArray[np.int64]] = []
+    with (
+        tempfile.TemporaryFile() as inputs,
+        tempfile.TemporaryFile() as targets,
+    ):
+        spools = {"input": inputs, "target": targets}
+        for batch in _batched(lines, COLUMNAR_BATCH_ROWS):
+            texts = {
+                "input": [f"{r['prefix']}: {r['input']}" for r in batch],
+                "target": [r["target"] for r in batch],
+            }
+            for name, spool in spools.items():
+                ids, n = byt5_ids(texts[name])
+                spool.write(ids.astype("<u2").tobytes())
+                lengths[name].append(n)
+            row_ids.append(np.array([r["id"] for r in batch], np.int64))
+
+        with zipfile.ZipFile(output, "w", zipfile.ZIP_STORED) as archive:
+            for name, spool in spools.items():
+                n = np.concatenate(lengths[name] or [np.empty(0, np.int64)])
+                offsets = np.zeros(len(n) + 1, dtype=np.int64)
+                np.cumsum(n, out=offsets[1:])
+                spool.seek(0)
+                _write_member(
+                    archive,
+                    f"{name}_ids",
+                    spool,
+                    np.dtype("<u2"),
+                    int(offsets[-1]),
+                )
+                _save_member(archive, f"{name}_offsets", offsets)
+                _save_member(archive, f"{name}_lengths", n.astype(np.int32))
+            _save_member(
+                archive,
+                "ids",
+                np.concatenate(row_ids or [np.empty(0, np.int64)]),
+            )
+
+
+def load_byte_ids(
+    path: str | os.PathLike, mmap: bool = True
+) -> dict[str, npt.NDArray[Any]]:
+    """Load arrays written in the `t5-bytes` format.
+
+    With `mmap`, arrays are memory-mapped straight from the archive instead
+    of being read into memory. The ids of row `i` are then
+    `input_ids[input_offsets[i]:input_offsets[i + 1]]`.
+    """
+    return load_arrays(path, mmap)
+
+
+def _write_member(
+    archive: zipfile.ZipFile,
+    name: str,
+    source: BinaryIO,
+    dtype: np.dtype,
+    size: int,
+) -> None:
+    header = {"descr": dtype.str, "fortran_order": False, "shape": (size,)}
+    with archive.open(f"{name}.npy", "w", force_zip64=True) as member:
+        np.lib.format.write_array_header_1_0(member, header)
+        shutil.copyfileobj(source, member)
+
+
+def _save_member(
+    archive: zipfile.ZipFile, name: str, array: npt.NDArray[Any]
+) -> None:
+    with archive.open(f"{name}.npy", "w", force_zip64=True) as member:
+        np.lib.format.write_array(member, array, allow_pickle=False)
+
+
+def _t5_batches(lines: Iterable[T5line]) -> Generator[Any, None, None]:
+    pa = _pyarrow()
+    schema = t5_schema()
+    for batch in _batched(lines, COLUMNAR_BATCH_ROWS):
+        yield pa.RecordBatch.from_arrays(
+            [
+                pa.array([r["id"] for r in batch], type=pa.int64()),
+                pa.array([r["prefix"] for r in batch]).dictionary_encode(),
+                pa.array([r["input"] for r in batch], type=pa.string()),
+                pa.array([r["target"] for r in batch], type=pa.string()),
+            ],
+            schema=schema,
+        )
+
+
+def _token_types(pa: Any) -> dict[str, Any]:
+    return {
+        f: pa.int32() if f == "sequence" else pa.string()
+        for f in TOKEN_COLUMNS
+    }
+
+
+def _pyarrow() -> Any:
+    try:
+        import pyarrow  # type: ignore
+    except ImportError as e:
+        raise WriteError(
+            "columnar formats require pyarrow; install manx[arrow]"
+        ) from e
+    return pyarrow
+
+
+def _binary(output: TextIO | BinaryIO) -> BinaryIO:
+    """Return the binary buffer underlying a text output."""
+    if isinstance(output, io.TextIOBase):
+        if not hasattr(output, "buffer"):
+            raise OutputError("columnar formats require a binary output")
+        output.flush()
+        return output.buffer  # type: ignore
+    return output  # type: ignore
+
+
+def _separated(
+    strings: Iterable[str], sep: str
+) -> Generator[str, None, None]:
+    """Yield strings with the separator in between them like `str.join`."""
+    for i, s in enumerate(strings):
+        if i:
+            yield sep
+        yield s
@@ -0,0 +1,44 @@
+# Standard library imports
+from typing import Any, Callable
+
+# Third-party library imports
+import pytest
+
+# Local library imports
+from manx import nlp
+from manx.nlp.tokens import Token
+from manx.parsing.tags import POS
+
+
+@pytest.fixture
+def make_docs() -> Callable[..., list[nlp.Doc]]:
+    """Return a factory of labelled docs d0, d1, ... with distinct tokens.
+
+    The factory takes the number of docs, the number of tokens per doc or a
+    function of the doc number giving it, and optionally a function of the
+    doc and token numbers giving Token fields that replace the defaults.
+    """
+    def _make(
+        n: int,
+        length: int | Callable[[int], int],
+        fields: Callable[[int, int], dict[str, Any]] | None = None,
+    ) -> list[nlp.Doc]:
+        def _tokens(d: int) -> list[Token]:
+            size = length(d) if callable(length) else length
+            return [
+                Token(
+                    **{
+                        "lexel": f"l{d}.{i}",
+                        "stripped_lexel": f"l{d}.{i}",
+                        "grammel": "",
+                        "form": f"F{d}.{i}",
+                        "stripped_form": f"F{d}.{i}",
+                        "sequence": i,
+                        "_pos": POS.Undef,
+                        "_label": f"d{d}",
+                        **(fields(d, i) if fields else {}),
+                    }
+                ) for i in range(size)
+            ]
+        return [nlp.Doc(elems=_tokens(d), label=f"d{d}") for d in range(n)]
+    return _make
@@ -1,16 +1,22 @@
 # Standard library imports
+import asyncio
+from io import StringIO
+import threading
 from unittest import mock
 
 # Third-party library imports
 import fastapi
+import numpy as np
 from fastapi.testclient import TestClient
 import pytest
 
 # Local library imports
-from manx.api import app
-from manx.api.data_model import Response
-from manx.api.lemmatize import _process
+from manx.api import app, Batcher
+from manx.api.data_model import Request, Response
+from manx.api.lemmatize import _process, executor, health, process
+from manx.api.lexicon import Lexicon
 from manx.config import settings
+from manx.parsing import DictParser
 
 
 @pytest.fixture(scope="module")
@@ -25,6 +31,12 @@ class TestAPI:
         response = client.get("v1/health")
         assert response.status_code == fastapi.status.HTTP_200_OK
 
+    def test_cache_stats(self, client: TestClient) -> None:
+        """Check if the cache endpoint reports prediction cache counters."""
+        response = client.get("v1/cache")
+        assert response.status_code == fastapi.status.HTTP_200_OK
+        assert {"hits", "misses", "entries", "bytes"} <= set(response.json())
+
     def test_lemmatize(self, client: TestClient) -> None:
         """Test if the lemmatization endpoint works as expected."""
         def _func(*args, **kwargs) -> str:
@@ -44,6 +56,29 @@ class TestAPI:
         )
 
 
+def test_process_off_event_loop() -> None:
+    """Health checks are answered while a text is being lemmatized."""
+    started, release = threading.Event(), threading.Event()
+
+    def _func(*args, **kwargs) -> str:
+        started.set()
+        release.wait(5)
+        return "done"
+
+    async def _main() -> Response:
+        task = asyncio.create_task(process(Request()))
+        while not started.is_set():
+            await asyncio.sleep(0.01)
+        assert await health() == fastapi.status.HTTP_200_OK
+        assert not task.done()
+        release.set()
+        return await task
+
+    with mock.patch("manx.api.lemmatize._process", new=_func):
+        assert asyncio.run(_main()).text == "done"
+    assert executor()._max_workers == settings.API_WORKERS
+
+
 @pytest.mark.parametrize(
     "text",
     [
@@ -55,8 +90,8 @@ class TestAPI:
 def test_process(text: str) -> None:
     """Test if the _process worker function operates as expected."""
 
-    def _predict(text: str, _: str = settings.T5_PREFIX) -> list[str]:
-        return [text]
+    def _predict(texts: list[str]) -> list[str]:
+        return texts
 
     have = _process(
         text=text,
@@ -64,3 +99,151 @@ def test_process(text: str) -> None:
         predict=_predict,
     )
     assert have == " ".join(text.split())
+
+
+@pytest.mark.parametrize("batch_size", [0, 1, 7, 32, 1000])
+def test_process_batches(batch_size: int) -> None:
+    """Windows are predicted in batches with the same stitched result."""
+    text = settings.API_TEXT_PLACEHOLDER
+    windows = len(text.split()) - settings.DEFAULT_NGRAM_SIZE + 1
+    batches: list[int] = []
+
+    def _predict(texts: list[str]) -> list[str]:
+        batches.append(len(texts))
+        return texts
+
+    have = _process(text=text, predict=_predict, batch_size=batch_size)
+    assert have == " ".join(text.split())
+    assert sum(batches) == windows
+    assert len(batches) == -(-windows // (batch_size or windows))
+    assert max(batches) <= (batch_size or windows)
+
+
+UNKNOWN_WORDS = {"GOST", "FOULE"}
+
+
+@pytest.fixture
+def lexicon() -> Lexicon:
+    words = sorted(set(settings.API_TEXT_PLACEHOLDER.split()) - UNKNOWN_WORDS)
+    return Lexicon(
+        forms=words,
+        lemmas=[w.lower() for w in words],
+        counts=np.full(len(words), 10, dtype=np.int64),
+    )
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        " ".join(settings.API_TEXT_PLACEHOLDER.split()[:5]),
+        " ".join(settings.API_TEXT_PLACEHOLDER.split()[:11]),
+        settings.API_TEXT_PLACEHOLDER,
+    ]
+)
+def test_process_with_lexicon(text: str, lexicon: Lexicon) -> None:
+    """Windows fully covered by the lexicon skip the model."""
+    calls: list[str] = []
+
+    def _predict(texts: list[str]) -> list[str]:
+        calls.extend(texts)
+        return texts
+
+    have = _process(
+        text=text,
+        window_size=settings.DEFAULT_NGRAM_SIZE,
+        predict=_predict,
+        lexicon=lexicon,
+    )
+    want = [lexicon.get(w) or w for w in text.split()]
+    assert have.split() == want
+    assert len(calls) == len(UNKNOWN_WORDS & set(text.split()))
+
+
+def test_process_fully_resolved(lexicon: Lexicon) -> None:
+    """The model is not called when every word is in the lexicon."""
+    text = " ".join(
+        w for w in settings.API_TEXT_PLACEHOLDER.split()
+        if w not in UNKNOWN_WORDS
+    )
+
+    def _predict(texts: list[str]) -> list[str]:
+        raise AssertionError("model should not be called")
+
+    have = _process(text=text, predict=_predict, lexicon=lexicon)
+    assert have == text.lower()
+
+
+@pytest.mark.parametrize("max_batch_size", [1, 4, 32])
+def test_batcher(max_batch_size: int) -> None:
+    """Windows of concurrent callers share batches but keep their results."""
+    sizes: list[int] = []
+    gate = threading.Barrier(8)
+
+    def _predict(texts: list[str]) -> list[str]:
+        sizes.append(len(texts))
+        return [t.upper() for t in texts]
+
+    batcher = Batcher(_predict, max_batch_size, max_wait=0.05)
+    results: dict[int, list[str]] = {}
+
+    def _request(n: int) -> None:
+        gate.wait()
+        results[n] = batcher([f"w{n}.{i}" for i in range(n + 1)])
+
+    threads = [threading.Thread(target=_request, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == {
+        n: [f"W{n}.{i}" for i in range(n + 1)] for n in range(8)
+    }
+    assert sum(sizes) == 36
+    assert max(sizes) <= max_batch_size
+    assert batcher.batches == len(sizes) < 8 + 36 // max_batch_size
+
+
+def test_batcher_error() -> None:
+    """Model errors reach every caller of the batch."""
+
+    def _predict(texts: list[str]) -> list[str]:
+        raise RuntimeError("model failed")
+
+    with pytest.raises(RuntimeError):
+        Batcher(_predict, max_wait=0)(["a", "b"])
+    with pytest.raises(ValueError):
+        Batcher(_predict, max_batch_size=0)
+
+
+def test_batcher_short_predictions() -> None:
+    """Callers fail instead of waiting when predictions are missing."""
+
+    def _predict(texts: list[str]) -> list[str]:
+        return texts[:-1]
+
+    batcher = Batcher(_predict, max_batch_size=2, max_wait=0.05)
+    futures = [batcher.submit(w) for w in ["a", "b"]]
+    for future in futures:
+        with pytest.raises(ValueError):
+            future.result(timeout=5)
+
+
+def test_lexicon_from_table(tmp_path) -> None:
+    """Only forms with a single attested lexel enter the lexicon."""
+    table = DictParser().table(
+        StringIO(
+            "|1|'son'|'n'|'SUNE'|2||\n"
+            "|1|'sun'|'n'|'SUNE'|1||\n"
+            "|1|'son'|'nG'|'SUN+ES'|3||\n"
+            "|2|'son'|'n'|'*SUN+ES'|4||\n"
+            "|2|'be:tan'|'vpp'|'I+BET'|1||\n"
+        )
+    )
+    lexicon = Lexicon.from_table(table, min_count=2)
+    assert len(lexicon) == 1
+    assert lexicon.get("SUNES") == "son"
+    assert lexicon.get("SUNE") is None
+    assert lexicon.get("IBET") is None
+    path = tmp_path / "lexicon.npz"
+    lexicon.save(path)
+    assert len(Lexicon.load(path)) == 2
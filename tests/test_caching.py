@@ -0,0 +1,92 @@
+# Standard library imports
+from pathlib import Path
+
+# Third-party library imports
+import pytest
+
+# Local library imports
+from manx.caching import CacheKey, PredictionCache
+
+
+def _key(window: str) -> CacheKey:
+    return CacheKey("byt5:model", "Lemmatize", window)
+
+
+def test_cache_lru() -> None:
+    """The least recently used predictions are evicted first."""
+    cache = PredictionCache(max_entries=2)
+    cache.put(_key("a"), "A")
+    cache.put(_key("b"), "B")
+    assert cache.get(_key("a")) == "A"
+    cache.put(_key("c"), "C")
+    assert cache.get(_key("b")) is None
+    assert cache.get(_key("a")) == "A"
+    assert cache.get(_key("c")) == "C"
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+@pytest.mark.parametrize("max_bytes, want", [(60, 2), (90, 3), (10, 0)])
+def test_cache_bytes(max_bytes: int, want: int) -> None:
+    """The cache holds no more bytes of keys and predictions than allowed."""
+    cache = PredictionCache(max_bytes=max_bytes)
+    for w in ["ȝer", "here", "hire"]:
+        cache.put(_key(w), w.upper())
+    assert len(cache) == want
+    assert cache.nbytes <= max_bytes
+    assert cache.stats() == {
+        "hits": 0,
+        "misses": 0,
+        "entries": want,
+        "bytes": cache.nbytes,
+    }
+
+
+def test_cache_update() -> None:
+    """Putting a cached key again replaces its prediction."""
+    cache = PredictionCache(max_entries=10)
+    cache.put(_key("a"), "A")
+    cache.put(_key("a"), "AA")
+    assert cache.get(_key("a")) == "AA"
+    assert cache.nbytes == len("byt5:modelLemmatizeaAA")
+
+
+def test_cache_persistence(tmp_path: Path) -> None:
+    """Predictions stored on disk are found by a new cache."""
+    path = tmp_path / "cache.sqlite"
+    cache = PredictionCache(max_entries=1, path=path)
+    cache.put(_key("a"), "A")
+    cache.put(_key("b"), "B")
+    assert cache.get(_key("a")) == "A"
+    cache.close()
+    cache = PredictionCache(max_entries=1, path=path)
+    assert len(cache) == 0
+    assert cache.get(_key("b")) == "B"
+    assert cache.get(_key("c")) is None
+    assert len(cache) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.close()
+
+
+@pytest.mark.parametrize(
+    "max_entries, max_bytes", [(0, 0), (-1, 100), (10, -1)]
+)
+def test_cache_limits(
+    max_entries: int, max_bytes: int, tmp_path: Path
+) -> None:
+    """Unbounded caches are refused, also when stored on disk."""
+    with pytest.raises(ValueError):
+        PredictionCache(max_entries, max_bytes, path=tmp_path / "cache")
+
+
+def test_cache_update_commits_once(tmp_path: Path, mocker) -> None:
+    """Many predictions are stored on disk in a single commit."""
+    connect = mocker.patch("manx.caching.sqlite3.connect")
+    cache = PredictionCache(max_entries=2, path=tmp_path / "cache.sqlite")
+    db = connect.return_value
+    db.reset_mock()
+    cache.update((_key(w), w.upper()) for w in ["a", "b", "c"])
+    assert db.commit.call_count == 1
+    ((_, rows), _) = db.executemany.call_args
+    assert [r[-1] for r in rows] == ["A", "B", "C"]
+    assert len(cache) == 2
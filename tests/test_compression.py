@@ -0,0 +1,198 @@
+# Standard library imports
+import argparse
+import gzip
+from pathlib import Path
+
+# Third-party library imports
+import pytest
+
+# Local library imports
+from manx import compression, console, nlp, writing
+from manx.compression import Compression
+from manx.corpus import fs
+from manx.model import settings
+from manx.nlp.tokens import Token
+from manx.parsing import dicts
+from manx.parsing.tags import POS
+
+
+SUFFIXES = {
+    Compression.Off: "",
+    Compression.Gzip: ".gz",
+    Compression.Zstd: ".zst",
+    Compression.Xz: ".xz",
+}
+
+
+def _require(codec: Compression) -> None:
+    if codec == Compression.Zstd:
+        pytest.importorskip("zstandard")
+
+
+@pytest.mark.parametrize(
+    "name, want, stripped",
+    [
+        ("data.csv", Compression.Off, "data.csv"),
+        ("data.csv.gz", Compression.Gzip, "data.csv"),
+        ("data.jsonl.ZST", Compression.Zstd, "data.jsonl"),
+        ("data.tag.xz", Compression.Xz, "data.tag"),
+    ]
+)
+def test_detect(name: str, want: Compression, stripped: str) -> None:
+    """Compression is told from the file suffix."""
+    assert compression.detect(name) == want
+    assert compression.strip_suffix(name) == stripped
+
+
+@pytest.mark.parametrize("codec", list(Compression))
+@pytest.mark.parametrize("level", [None, 1])
+def test_xopen_round_trip(
+    codec: Compression, level: int | None, tmp_path: Path
+) -> None:
+    """Text written through xopen reads back the same."""
+    _require(codec)
+    path = tmp_path / f"out.txt{SUFFIXES[codec]}"
+    text = "ȝe lines\n" * 1000
+    with compression.xopen(path, "w", level=level) as f:
+        f.write(text)
+    with compression.xopen(path) as f:
+        assert f.read() == text
+    if codec != Compression.Off:
+        assert path.stat().st_size < len(text.encode())
+
+
+def test_xopen_explicit_compression(tmp_path: Path) -> None:
+    """An explicit compression overrides the file suffix."""
+    path = tmp_path / "out.txt"
+    with compression.xopen(path, "w", compression=Compression.Gzip) as f:
+        f.write("text")
+    assert gzip.decompress(path.read_bytes()) == b"text"
+
+
+@pytest.mark.parametrize("codec", list(Compression))
+def test_from_root_compressed(codec: Compression, tmp_path: Path) -> None:
+    """Corpus files are decompressed and named without the suffix."""
+    _require(codec)
+    tags = tmp_path / "tags"
+    tags.mkdir()
+    path = tags / f"text.tag{SUFFIXES[codec]}"
+    with compression.xopen(path, "w") as f:
+        f.write("$/n_SUNE\n")
+    (file,) = fs.from_root(str(tmp_path))
+    assert file.name == "text.tag"
+    assert file.text == "$/n_SUNE\n"
+
+
+def test_load_dicts_compressed(tmp_path: Path) -> None:
+    """Compressed dict files are picked up in a dicts directory."""
+    with compression.xopen(tmp_path / "first_mysql.txt.gz", "w") as f:
+        f.write("|1|'son'|'n'|'SUNE'|2||\n")
+    (tmp_path / "second_mysql.txt").write_text("|2|'son'|'n'|'SONE'|1||\n")
+    table = dicts.load_dicts(tmp_path)
+    assert table.forms("son") == ["SUNE", "SONE"]
+
+
+@pytest.mark.parametrize(
+    "fmt",
+    [
+        writing.Format.T5input,
+        writing.Format.JSONLines,
+        writing.Format.T5Bytes,
+    ]
+)
+def test_console_parse_compressed(
+    fmt: writing.Format, mocker, tmp_path: Path
+) -> None:
+    """The parse subcommand compresses output with a .gz suffix.
+
+    Compressed t5-bytes output is refused before the output is opened.
+    """
+    tokens = [
+        Token(
+            lexel=f"l{i}",
+            stripped_lexel=f"l{i}",
+            grammel="",
+            form=f"F{i}",
+            stripped_form=f"F{i}",
+            sequence=i,
+            _pos=POS.Undef,
+        ) for i in range(100)
+    ]
+    docs = [nlp.Doc(elems=tokens, label=f"d{i}") for i in range(10)]
+    mocker.patch("manx.console.iter_load", return_value=iter(docs))
+    path = tmp_path / "out.gz"
+    mocker.patch(
+        "argparse.ArgumentParser.parse_args",
+        return_value=argparse.Namespace(
+            command="parse",
+            from_web=False,
+            verbose=False,
+            root="",
+            snapshot=None,
+            include=[],
+            exclude=[],
+            min_size=0,
+            max_size=0,
+            output=str(path),
+            compress=None,
+            compress_level=None,
+            compress_threads=0,
+            format=fmt,
+            ngram_size=3,
+            chunk_size=settings.DEFAULT_CHUNK_SIZE,
+            prefix=settings.T5_PREFIX,
+            id_scheme="sequence",
+            output_dir=None,
+            shuffle_seed=None,
+            shuffle_buffer=settings.DEFAULT_SHUFFLE_BUFFER,
+            workers=1,
+            ngram_stride=1,
+            dedup="off",
+            bucket_window=0,
+            buckets=[],
+            bucket_stats=None,
+        )
+    )
+    if fmt == writing.Format.T5Bytes:
+        with pytest.raises(SystemExit):
+            console.main()
+        assert not path.exists()
+        return
+    console.main()
+    text = gzip.decompress(path.read_bytes()).decode()
+    if fmt == writing.Format.JSONLines:
+        assert text == "\n".join(writing.marshall_string(docs, fmt))
+    else:
+        assert text.count("\n") == 1 + len(
+            list(writing.marshall_csv(docs, ngram_size=3))
+        )
+
+
+@pytest.mark.parametrize("codec", list(Compression))
+def test_write_byte_ids_compressed(codec: Compression, tmp_path: Path) -> None:
+    """The t5-bytes output is only written uncompressed."""
+    _require(codec)
+    tokens = [
+        Token(
+            lexel=f"l{i}",
+            stripped_lexel=f"l{i}",
+            grammel="",
+            form=f"F{i}",
+            stripped_form=f"F{i}",
+            sequence=i,
+            _pos=POS.Undef,
+        ) for i in range(20)
+    ]
+    docs = [nlp.Doc(elems=tokens, label="d0")]
+    path = tmp_path / f"ids.npz{SUFFIXES[codec]}"
+    with compression.xopen(path, "w") as f:
+        assert compression.codec(f) == codec
+        if codec == Compression.Off:
+            writing.write(docs, f, fmt=writing.Format.T5Bytes, ngram_size=3)
+        else:
+            with pytest.raises(writing.WriteError):
+                writing.write(
+                    docs, f, fmt=writing.Format.T5Bytes, ngram_size=3
+                )
+    if codec == Compression.Off:
+        assert len(writing.load_byte_ids(path)["ids"]) == 18
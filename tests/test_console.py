@@ -13,6 +13,7 @@ import pytest
 from manx import console, nlp, writing
 from manx.model import settings
 from manx.nlp.tokens import Token
+from manx.parsing import DictParser
 from manx.parsing.tags import POS
 
 
@@ -69,9 +70,142 @@ def test_console_download(mocker) -> None:
         console.main()
 
 
-def test_console_parse(docs: list[nlp.Doc], mocker) -> None:
-    """See if the parse subcommand can be invoked from the CLI."""
-    mocker.patch("manx.console.load", return_value=docs)
+@pytest.mark.parametrize(
+    "fmt, dedup, reported",
+    [
+        (writing.Format.T5input, "off", False),
+        (writing.Format.T5input, "exact", True),
+        (writing.Format.JSONLines, "exact", False),
+    ]
+)
+def test_console_parse(
+    docs: list[nlp.Doc],
+    mocker,
+    capsys,
+    fmt: writing.Format,
+    dedup: str,
+    reported: bool,
+) -> None:
+    """See if the parse subcommand can be invoked from the CLI.
+
+    Dropped duplicates are only reported for T5 formats.
+    """
+    mocker.patch("manx.console.iter_load", return_value=iter(docs))
+    mocker.patch(
+        "argparse.ArgumentParser.parse_args",
+        return_value=argparse.Namespace(
+            command="parse",
+            from_web=False,
+            verbose=False,
+            root="",
+            snapshot=None,
+            include=[],
+            exclude=[],
+            min_size=0,
+            max_size=0,
+            output=StringIO(""),
+            format=fmt,
+            ngram_size=settings.DEFAULT_NGRAM_SIZE,
+            chunk_size=settings.DEFAULT_CHUNK_SIZE,
+            prefix=settings.T5_PREFIX,
+            id_scheme=settings.ID_SCHEME,
+            output_dir=None,
+            shuffle_seed=None,
+            shuffle_buffer=settings.DEFAULT_SHUFFLE_BUFFER,
+            workers=1,
+            ngram_stride=1,
+            dedup=dedup,
+            bucket_window=0,
+            buckets=[],
+            bucket_stats=None,
+        )
+    )
+    with does_not_raise():
+        console.main()
+    assert ("dropped" in capsys.readouterr().err) == reported
+
+
+def test_console_parse_missing_root(mocker, tmp_path) -> None:
+    """See if a missing root is reported before the output is opened."""
+    output = tmp_path / "out.csv"
+    mocker.patch(
+        "argparse.ArgumentParser.parse_args",
+        return_value=argparse.Namespace(
+            command="parse",
+            from_web=False,
+            verbose=False,
+            root=str(tmp_path / "missing"),
+            snapshot=None,
+            include=[],
+            exclude=[],
+            min_size=0,
+            max_size=0,
+            output=str(output),
+            format=writing.Format.T5input,
+            id_scheme=settings.ID_SCHEME,
+        )
+    )
+    with pytest.raises(ValueError):
+        console.main()
+    assert not output.exists()
+
+
+def test_console_parse_buckets(
+    docs: list[nlp.Doc], mocker, tmp_path
+) -> None:
+    """See if the parse subcommand writes T5 line bucket statistics."""
+    mocker.patch("manx.console.iter_load", return_value=iter(docs))
+    stats = tmp_path / "stats.csv"
+    mocker.patch(
+        "argparse.ArgumentParser.parse_args",
+        return_value=argparse.Namespace(
+            command="parse",
+            from_web=False,
+            verbose=False,
+            root="",
+            snapshot=None,
+            include=[],
+            exclude=[],
+            min_size=0,
+            max_size=0,
+            output=StringIO(""),
+            format=writing.Format.T5input,
+            ngram_size=settings.DEFAULT_NGRAM_SIZE,
+            chunk_size=settings.DEFAULT_CHUNK_SIZE,
+            prefix=settings.T5_PREFIX,
+            id_scheme=settings.ID_SCHEME,
+            output_dir=None,
+            shuffle_seed=None,
+            shuffle_buffer=settings.DEFAULT_SHUFFLE_BUFFER,
+            workers=1,
+            ngram_stride=1,
+            bucket_window=100,
+            buckets=[8, 16],
+            bucket_stats=str(stats),
+            dedup="exact",
+        )
+    )
+    console.main()
+    assert stats.read_text().startswith("bucket,bound,rows,")
+
+
+@pytest.mark.parametrize(
+    "buckets, error",
+    [
+        ({}, False),
+        ({"bucket_window": 100}, True),
+        ({"buckets": [8, 16]}, True),
+        ({"bucket_stats": "stats.csv"}, True),
+    ]
+)
+def test_console_parse_shards(
+    docs: list[nlp.Doc], mocker, tmp_path, buckets: dict, error: bool
+) -> None:
+    """See if the parse subcommand writes sharded T5 output.
+
+    T5 line bucketing is not supported for sharded output.
+    """
+    mocker.patch("manx.console.iter_load", return_value=iter(docs))
     mocker.patch(
         "argparse.ArgumentParser.parse_args",
         return_value=argparse.Namespace(
@@ -79,15 +213,116 @@ def test_console_parse(docs: list[nlp.Doc], mocker) -> None:
             from_web=False,
             verbose=False,
             root="",
+            snapshot=None,
+            include=[],
+            exclude=[],
+            min_size=0,
+            max_size=0,
             output=StringIO(""),
             format=writing.Format.T5input,
             ngram_size=settings.DEFAULT_NGRAM_SIZE,
             chunk_size=settings.DEFAULT_CHUNK_SIZE,
             prefix=settings.T5_PREFIX,
+            id_scheme=settings.ID_SCHEME,
+            output_dir=str(tmp_path),
+            split=list(settings.DEFAULT_SPLIT),
+            split_by="chunk",
+            seed=settings.DEFAULT_SEED,
+            shard_rows=settings.DEFAULT_SHARD_ROWS,
+            shard_size=0,
+            shuffle_seed=1,
+            shuffle_buffer=settings.DEFAULT_SHUFFLE_BUFFER,
+            workers=1,
+            ngram_stride=2,
+            dedup="near",
+            **{
+                "bucket_window": 0,
+                "buckets": [],
+                "bucket_stats": None,
+                **buckets,
+            },
+        )
+    )
+    if error:
+        with pytest.raises(SystemExit):
+            console.main()
+    else:
+        with does_not_raise():
+            console.main()
+    assert (tmp_path / "manifest.json").exists() != error
+
+
+def test_console_concordance(docs: list[nlp.Doc], mocker) -> None:
+    """See if the concordance subcommand can be invoked from the CLI."""
+    mocker.patch("manx.console.load", return_value=docs)
+    output = StringIO("")
+    mocker.patch(
+        "argparse.ArgumentParser.parse_args",
+        return_value=argparse.Namespace(
+            command="concordance",
+            from_web=False,
+            verbose=False,
+            root="",
+            snapshot=None,
+            output=output,
+            lexel=None,
+            form=None,
+            regex=None,
+            pos="Undef",
+            left=settings.DEFAULT_CONTEXT_SIZE,
+            right=settings.DEFAULT_CONTEXT_SIZE,
+            strip=False,
         )
     )
     with does_not_raise():
         console.main()
+    assert len(output.getvalue().splitlines()) == 1000
+
+
+@pytest.mark.parametrize(
+    "kind", ["frequency", "documents", "ambiguity", "cooccurrence"]
+)
+def test_console_stats(docs: list[nlp.Doc], kind: str, mocker) -> None:
+    """See if the stats subcommand can be invoked from the CLI."""
+    mocker.patch("manx.console.load", return_value=docs)
+    mocker.patch(
+        "argparse.ArgumentParser.parse_args",
+        return_value=argparse.Namespace(
+            command="stats",
+            from_web=False,
+            verbose=False,
+            root="",
+            snapshot=None,
+            output=StringIO(""),
+            kind=kind,
+            field=nlp.Field.Form.value,
+            window=2,
+            min_count=1,
+            format=nlp.TableFormat.CSV.value,
+        )
+    )
+    with does_not_raise():
+        console.main()
+
+
+def test_console_lexicon(mocker, tmp_path) -> None:
+    """See if the lexicon subcommand can be invoked from the CLI."""
+    table = DictParser().table(StringIO("|1|'son'|'n'|'SUNE'|2||\n"))
+    mocker.patch("manx.console.load_dictionary", return_value=table)
+    output = tmp_path / "lexicon.npz"
+    mocker.patch(
+        "argparse.ArgumentParser.parse_args",
+        return_value=argparse.Namespace(
+            command="lexicon",
+            from_web=False,
+            verbose=False,
+            root="",
+            output=str(output),
+        )
+    )
+    with does_not_raise():
+        console.main()
+    assert output.exists()
 
 
 def test_console_api(mocker) -> None:
@@ -103,3 +338,21 @@ def test_console_api(mocker) -> None:
     )
     with does_not_raise():
         console.main()
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["concordance", "-r", "root", "--form", "SUNE", "--left", "-1"],
+        ["concordance", "-r", "root", "--form", "SUNE", "--right", "-2"],
+        ["parse", "-r", "root", "--shuffle-buffer", "0"],
+        ["parse", "-r", "root", "--shuffle-buffer", "-3"],
+        ["parse", "-r", "root", "--ngram-stride", "0"],
+        ["parse", "-r", "root", "--ngram-stride", "-3"],
+    ]
+)
+def test_console_invalid_args(argv: list[str], mocker) -> None:
+    """See if invalid argument values are rejected by the parser."""
+    mocker.patch("sys.argv", ["manx", *argv])
+    with pytest.raises(SystemExit):
+        console.get_args()
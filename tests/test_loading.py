@@ -1,3 +1,10 @@
+# Standard library imports
+import os
+from pathlib import Path
+import subprocess
+import sys
+import types
+
 # Third-party library imports
 import pytest
 
@@ -5,7 +12,8 @@ import pytest
 from manx.corpus.download import Downloader
 from manx.corpus.file import CorpusFile
 from manx.corpus.fs import FileContents
-from manx.loading import load
+from manx.corpus import fs
+from manx.loading import iter_load, load, load_dictionary
 
 
 @pytest.fixture
@@ -49,3 +57,104 @@ def test_load_error() -> None:
     """Chekc if empty root string raises value error."""
     with pytest.raises(ValueError):
         load(from_web=False, verbose=False, root="")
+
+
+@pytest.fixture
+def root(tmp_path) -> str:
+    (tmp_path / "tags").mkdir()
+    (tmp_path / "texts").mkdir()
+    for i in range(5):
+        (tmp_path / "tags" / f"file_{i}.tag").write_text(
+            "$ge:ara/av_YORE\n$be/vpt13_WAS"
+        )
+    (tmp_path / "texts" / "file_0.txt").write_text("text")
+    return str(tmp_path)
+
+
+def test_iter_load(root: str, mocker) -> None:
+    """Tag files are read one at a time as Docs are consumed."""
+    read = mocker.spy(fs, "_read")
+    docs = iter_load(root=root)
+    assert isinstance(docs, types.GeneratorType)
+    assert read.call_count == 0
+    first = next(docs)
+    assert read.call_count == 1
+    assert len(first) == 2
+    rest = list(docs)
+    assert read.call_count == 5
+    assert [d.label for d in [first, *rest]] == [
+        d.label for d in load(root=root)
+    ]
+
+
+@pytest.mark.parametrize(
+    "selection, want",
+    [
+        ({}, ["file_0", "file_1", "file_2", "file_3", "file_4"]),
+        ({"include": ["file_[12]"]}, ["file_1", "file_2"]),
+        ({"exclude": ["*_0", "file_4"]}, ["file_1", "file_2", "file_3"]),
+        ({"include": ["file_*"], "exclude": ["file_3"]},
+         ["file_0", "file_1", "file_2", "file_4"]),
+        ({"min_size": 100}, ["file_3"]),
+        ({"max_size": 50}, ["file_0", "file_1", "file_2", "file_4"]),
+    ]
+)
+def test_iter_load_selection(
+    root: str, selection: dict, want: list[str], mocker
+) -> None:
+    """Only selected tag files are read and parsed."""
+    (Path(root) / "tags" / "file_3.tag").write_text(
+        "$ge:ara/av_YORE\n" * 10
+    )
+    read = mocker.spy(fs, "_read")
+    docs = list(iter_load(root=root, **selection))
+    assert sorted(d.label for d in docs) == want
+    assert read.call_count == len(want)
+
+
+def test_iter_load_checks_root(tmp_path: Path) -> None:
+    """A missing root is reported before the first Doc is asked for."""
+    with pytest.raises(ValueError):
+        iter_load(root=str(tmp_path / "missing"))
+
+
+def test_sequence_id_setting(root: str) -> None:
+    """The sequence setting applies to loaded docs, not to bare Docs."""
+    script = (
+        "import sys\n"
+        "from manx import load, nlp\n"
+        "from manx.nlp.tokens import Token\n"
+        "from manx.parsing import POS\n"
+        "d = nlp.Doc([Token('l', 'l', '', 'F', 'F', 0, POS.Undef)])\n"
+        "assert d.id and d.tokens[0].id and d.label == ''\n"
+        "docs = load(root=sys.argv[1])\n"
+        "assert all(d.id == d.label for d in docs), [d.id for d in docs]\n"
+        "assert docs[0].tokens[1].id == f'{docs[0].label}:1'\n"
+    )
+    env = {**os.environ, "MANX_ID_SCHEME": "sequence"}
+    result = subprocess.run(
+        [sys.executable, "-c", script, root],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+
+
+@pytest.mark.parametrize("from_web", [True, False])
+def test_load_dictionary(
+    root: str, from_web: bool, monkeypatch, mocker
+) -> None:
+    """Dict tables are built from the dict files only."""
+    dicts = Path(root) / "dicts"
+    dicts.mkdir()
+    (dicts / "first_mysql.txt").write_text("|1|'son'|'n'|'SUNE'|2||\n")
+    (dicts / "second_mysql.txt").write_text("|2|'son'|'n'|'SONE'|1||\n")
+    monkeypatch.setattr(
+        Downloader, "download", lambda x, y: fs.from_root(root)
+    )
+    read = mocker.spy(fs, "_read")
+    table = load_dictionary(from_web=from_web, root=root)
+    assert sorted(table.forms("son")) == ["SONE", "SUNE"]
+    if not from_web:
+        assert read.call_count == 0
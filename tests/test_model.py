@@ -1,8 +1,15 @@
 # Standard library imports
 from contextlib import nullcontext as does_not_raise
+from unittest import mock
+
+# Third-party library imports
+import pytest
+import torch
+from transformers import BatchEncoding
 
 # Local library imports
-from manx.model import t5
+from manx.caching import PredictionCache
+from manx.model import T5, t5
 
 
 def test_t5_predict(monkeypatch) -> None:
@@ -17,3 +24,78 @@ def test_t5_predict(monkeypatch) -> None:
         t5.predict(
             "NIyIG HIS DEYD~ ME BURIICTH HIM COVE COMEZ yE yUNGE STRUPLING"
         )
+
+
+class _Tokenizer:
+    """Tokenizer stand-in encoding characters as padded code points."""
+
+    def __call__(self, texts: list[str], **kwargs) -> BatchEncoding:
+        width = max(len(t) for t in texts)
+        ids = [[ord(c) for c in t] + [0] * (width - len(t)) for t in texts]
+        mask = [[1] * len(t) + [0] * (width - len(t)) for t in texts]
+        return BatchEncoding(
+            {
+                "input_ids": torch.tensor(ids),
+                "attention_mask": torch.tensor(mask),
+            }
+        )
+
+    def batch_decode(self, ids: torch.Tensor, **kwargs) -> list[str]:
+        return ["".join(chr(c) for c in row if c) for row in ids.tolist()]
+
+
+class _Model:
+    """Model stand-in generating the upper-cased input."""
+
+    def __init__(self) -> None:
+        self.batches: list[int] = []
+
+    def generate(
+        self, input_ids: torch.Tensor, attention_mask: torch.Tensor, **kwargs
+    ) -> torch.Tensor:
+        self.batches.append(len(input_ids))
+        return torch.where(
+            (input_ids >= ord("a")) & (input_ids <= ord("z")),
+            input_ids - 32,
+            input_ids,
+        ) * attention_mask
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 3, 32])
+def test_t5_predict_batch(batch_size: int) -> None:
+    """Batched predictions come back in the order of the input texts."""
+    model = T5()
+    model._model = mock.Mock(
+        tokenizer=_Tokenizer(), model=_Model(), device="cpu"
+    )
+    texts = ["ab", "abcdef", "a", "abcd", "abc"]
+    preds = model.predict_batch(texts, prefix="p", batch_size=batch_size)
+    assert preds == [f"P: {t.upper()}" for t in texts]
+    assert model._model.model.batches == [
+        min(batch_size, len(texts) - i)
+        for i in range(0, len(texts), batch_size)
+    ]
+
+
+def test_t5_predict_batch_error() -> None:
+    """Batch size must be positive."""
+    with pytest.raises(ValueError):
+        T5().predict_batch(["text"], batch_size=0)
+
+
+def test_t5_predict_batch_cache() -> None:
+    """Cached and repeated windows are not passed to the model again."""
+    model = T5()
+    model._model = mock.Mock(
+        tokenizer=_Tokenizer(), model=_Model(), device="cpu"
+    )
+    model._cache = PredictionCache(max_entries=10)
+    assert model.predict_batch(["ab", "cd", "ab"], prefix="p") == [
+        "P: AB",
+        "P: CD",
+        "P: AB",
+    ]
+    assert model.predict_batch(["cd", "ef"], prefix="p") == ["P: CD", "P: EF"]
+    assert model.predict_batch(["cd"], prefix="q") == ["Q: CD"]
+    assert model._model.model.batches == [2, 1, 1]
+    assert (model.cache.hits, model.cache.misses) == (1, 4)
@@ -4,11 +4,12 @@
 from io import StringIO
 
 # Third-party library imports
+import numpy as np
 import pytest
 
 # Local library imports
 from manx import parsing
-from manx.nlp import tokens
+from manx.nlp import index, kwic, stats, tokens
 from .test_parsing import tag_file_sample
 
 
@@ -96,3 +97,224 @@ def test_ngrams(n: int, want: int, tag_file_sample: StringIO) -> None:
     d = tokens.doc(list(parser.parse(tag_file_sample)))
     ngrms = tokens.ngrams(d[:], n=n)
     assert len(ngrms) == want
+
+
+def test_sequence_ids_are_deterministic(
+    parsed: list[parsing.TagLine],
+) -> None:
+    """Sequence identifiers are derived from the label and token position."""
+    scheme = tokens.IdScheme.Sequence
+    t1 = tokens.doc(parsed, label="tituslang2t", id_scheme=scheme)
+    t2 = tokens.doc(parsed, label="tituslang2t", id_scheme=scheme)
+    assert t1.asdict() == t2.asdict()
+    assert t1.id == "tituslang2t"
+    assert [t.id for t in t1.tokens] == [
+        "tituslang2t:0",
+        "tituslang2t:1",
+        "tituslang2t:2",
+    ]
+
+
+@pytest.mark.parametrize("label", [None, ""])
+def test_sequence_ids_require_label(
+    parsed: list[parsing.TagLine], label: str | None
+) -> None:
+    """Unlabelled documents are rejected under the sequence scheme."""
+    scheme = tokens.IdScheme.Sequence
+    with pytest.raises(ValueError):
+        tokens.doc(parsed, label=label, id_scheme=scheme)
+    with pytest.raises(ValueError):
+        tokens.Doc(elems=[], label=label, id_scheme=scheme)
+
+
+def test_doc_pos_matrix(parsed: list[parsing.TagLine]) -> None:
+    """The Doc POS matrix stacks one-hot vectors of its tokens."""
+    d = tokens.doc(parsed)
+    want = np.stack([t.one_hot_pos_vector for t in d.tokens])
+    assert np.array_equal(d.pos_matrix(), want)
+    assert np.array_equal(d.pos_indices(), want.argmax(axis=1))
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_corpus_pos_matrix(
+    parsed: list[parsing.TagLine], sparse: bool
+) -> None:
+    """The corpus POS matrix concatenates rows of all Docs in order."""
+    if sparse:
+        pytest.importorskip("scipy")
+    docs = [tokens.doc(parsed), tokens.doc(parsed[:1])]
+    have = tokens.pos_matrix(docs, sparse=sparse)
+    if sparse:
+        have = have.toarray()
+    want = np.vstack([d.pos_matrix() for d in docs])
+    assert have.shape == (4, len(parsing.POS))
+    assert np.array_equal(have, want)
+
+
+@pytest.fixture
+def corpus(parsed: list[parsing.TagLine]) -> index.Corpus:
+    return index.Corpus(
+        [
+            tokens.doc(parsed, label="first"),
+            tokens.doc(parsed[::-1], label="second"),
+        ]
+    )
+
+
+@pytest.mark.parametrize(
+    "field, key, want",
+    [
+        (index.Field.Lexel, "son", [[0, 0], [1, 2]]),
+        (index.Field.Form, "I+BET", [[0, 2], [1, 0]]),
+        (index.Field.Grammel, "P21N", [[0, 1], [1, 1]]),
+        (index.Field.POS, "Verb", [[0, 2], [1, 0]]),
+        (index.Field.Form, "missing", []),
+    ]
+)
+def test_corpus_postings(
+    corpus: index.Corpus, field: index.Field, key: str, want: list[list[int]]
+) -> None:
+    """Inverted indexes return (doc, position) postings of each key."""
+    have = corpus.postings(field, key)
+    assert have.reshape(-1, 2).tolist() == want
+
+
+def test_corpus_postings_by_label(corpus: index.Corpus) -> None:
+    """Postings can be restricted to a single document."""
+    have = corpus.postings(index.Field.Lexel, "son", label="second")
+    assert have.tolist() == [[1, 2]]
+    assert [t.form for t in corpus.tokens(index.Field.Lexel, "son")] == [
+        "SUN+ES",
+        "SUN+ES",
+    ]
+
+
+def test_corpus_values(corpus: index.Corpus) -> None:
+    """Distinct values of one field are collected for a key of another."""
+    assert corpus.values(
+        index.Field.Lexel, "son", of=index.Field.Form
+    ) == ["SUN+ES"]
+    assert corpus.values(
+        index.Field.StrippedForm, "IBET", of=index.Field.Lexel
+    ) == ["be:tan"]
+
+
+def test_corpus_indexes_round_trip(corpus: index.Corpus, tmp_path) -> None:
+    """Saved indexes are loaded back for the same corpus only."""
+    path = tmp_path / "indexes.npz"
+    want = corpus.postings(index.Field.Lexel, "son")
+    corpus.save_indexes(path)
+    loaded = index.Corpus(corpus.docs)
+    loaded.load_indexes(path)
+    assert index.Field.Lexel in loaded._indexes
+    assert np.array_equal(loaded.postings(index.Field.Lexel, "son"), want)
+    other = index.Corpus(corpus.docs[:1])
+    with pytest.raises(index.CorpusIndexError):
+        other.load_indexes(path)
+
+
+@pytest.mark.parametrize(
+    "query, left, right, want",
+    [
+        (
+            kwic.Query(index.Field.Lexel, "son"),
+            1,
+            1,
+            [
+                ("first", 0, "", "SUN+ES", "wE"),
+                ("second", 2, "wE", "SUN+ES", ""),
+            ],
+        ),
+        (
+            kwic.Query(index.Field.Form, "^[wI]", regex=True),
+            5,
+            0,
+            [
+                ("first", 1, "SUN+ES", "wE", ""),
+                ("first", 2, "SUN+ES wE", "I+BET", ""),
+                ("second", 0, "", "I+BET", ""),
+                ("second", 1, "I+BET", "wE", ""),
+            ],
+        ),
+        (
+            kwic.Query(index.Field.POS, "Pron"),
+            0,
+            5,
+            [
+                ("first", 1, "", "wE", "I+BET"),
+                ("second", 1, "", "wE", "SUN+ES"),
+            ],
+        ),
+    ]
+)
+def test_concordance(
+    corpus: index.Corpus,
+    query: kwic.Query,
+    left: int,
+    right: int,
+    want: list[tuple[str, int, str, str, str]],
+) -> None:
+    """Concordance lines come in corpus order with the requested context."""
+    lines = kwic.concordance(corpus, query, left=left, right=right)
+    have = [
+        (ln.label, ln.position, ln.left, ln.keyword, ln.right) for ln in lines
+    ]
+    assert have == want
+
+
+@pytest.mark.parametrize("left, right", [(-1, 5), (5, -1)])
+def test_concordance_negative_context(
+    corpus: index.Corpus, left: int, right: int
+) -> None:
+    """Negative context sizes are rejected."""
+    query = kwic.Query(index.Field.POS, "Pron")
+    with pytest.raises(ValueError):
+        kwic.concordance(corpus, query, left=left, right=right)
+
+
+def test_frequencies(corpus: index.Corpus) -> None:
+    """Frequency tables count tokens per field value."""
+    table = stats.frequencies(corpus, index.Field.POS)
+    assert list(table.rows()) == [
+        ("Noun", 2, 1 / 3),
+        ("Pron", 2, 1 / 3),
+        ("Verb", 2, 1 / 3),
+    ]
+
+
+def test_per_document(corpus: index.Corpus) -> None:
+    """Per-document tables count field values within each document."""
+    table = stats.per_document(corpus, index.Field.Lexel)
+    assert len(table) == 6
+    assert set(r[0] for r in table.rows()) == {"first", "second"}
+    assert all(r[2] == 1 for r in table.rows())
+
+
+def test_ambiguity(parsed: list[parsing.TagLine]) -> None:
+    """Forms attested with several lemmas come first."""
+    extra = parsing.TagLine(*["$", "sun", "n", "SUN+ES"])
+    corpus = index.Corpus([tokens.doc(parsed + [extra])])
+    table = stats.ambiguity(corpus)
+    assert next(table.rows()) == ("SUNES", 2, 2, 0.5)
+
+
+def test_cooccurrences(corpus: index.Corpus) -> None:
+    """Co-occurrences are counted within documents only."""
+    table = stats.cooccurrences(corpus, index.Field.POS, window=2)
+    have = {(k, c): n for k, c, n in table.rows()}
+    assert have == {
+        ("Noun", "Pron"): 1,
+        ("Pron", "Verb"): 1,
+        ("Noun", "Verb"): 1,
+        ("Verb", "Pron"): 1,
+        ("Pron", "Noun"): 1,
+        ("Verb", "Noun"): 1,
+    }
+
+
+@pytest.mark.parametrize("fmt", list(stats.TableFormat))
+def test_table_dump(corpus: index.Corpus, fmt: stats.TableFormat) -> None:
+    """Tables are written out as CSV or JSON."""
+    output = StringIO()
+    stats.frequencies(corpus, index.Field.POS).dump(output, fmt)
+    assert "Noun" in output.getvalue()
@@ -1145,3 +1145,33 @@ def test_pronoun_parsing(instance: tuple[str, str], want: str) -> None:
     p = prons.Pronoun(*instance)
     have = p.mapped
     assert have == want
+
+
+def test_dict_table(dict_file_sample: StringIO) -> None:
+    """The columnar table holds the same lines as the streaming parser."""
+    want = list(dicts.DictParser().parse(dict_file_sample))
+    dict_file_sample.seek(0)
+    table = dicts.load_dicts(dict_file_sample)
+    assert len(table) == 8
+    assert list(table) == want
+    records = table.records()
+    assert records["form"][4] == "*COMEZ"
+    assert records["count"].sum() == 8
+
+
+def test_dict_table_indexes(tmp_path) -> None:
+    """Form and lexel lookups work across all dict files in a directory."""
+    (tmp_path / "first_mysql.txt").write_text(
+        "|1|'son'|'n'|'SUNE'|2||\n"
+        "|1|'sun'|'n'|'SUNE'|1||\n"
+        "|1|'son'|'nG'|'SUN+ES'|1||\n"
+    )
+    (tmp_path / "second_mysql.txt").write_text("|2|'son'|'n'|'SONE'|1||\n")
+    (tmp_path / "second.txt").write_text("not a dict file\n")
+    table = dicts.load_dicts(tmp_path)
+    assert len(table) == 4
+    assert table.candidates(1, "SUNE") == ["son", "sun"]
+    assert table.candidates(2, "SUNE") == []
+    assert table.candidates(1, "missing") == []
+    assert table.forms("son") == ["SUNE", "SUN+ES", "SONE"]
+    assert table.forms("missing") == []
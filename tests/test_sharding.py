@@ -0,0 +1,90 @@
+# Standard library imports
+import hashlib
+import json
+from pathlib import Path
+from typing import Callable
+
+# Third-party library imports
+import pytest
+
+# Local library imports
+from manx import nlp, sharding, writing
+
+
+@pytest.fixture
+def docs(
+    make_docs: Callable[..., list[nlp.Doc]]
+) -> list[nlp.Doc]:
+    return make_docs(20, 50)
+
+
+@pytest.mark.parametrize("split_by", list(sharding.SplitBy))
+def test_write_shards(
+    docs: list[nlp.Doc], split_by: sharding.SplitBy, tmp_path: Path
+) -> None:
+    """Shards hold every T5 line once and match the manifest."""
+    manifest = sharding.write_shards(
+        docs,
+        tmp_path,
+        ratios=(0.6, 0.2, 0.2),
+        split_by=split_by,
+        max_rows=30,
+        ngram_size=5,
+        chunk_size=10,
+    )
+    assert json.loads((tmp_path / "manifest.json").read_text()) == manifest
+    total = len(list(writing.marshall_csv(docs, ngram_size=5, chunk_size=10)))
+    assert sum(manifest["rows"].values()) == total
+    for shard in manifest["shards"]:
+        data = (tmp_path / shard["file"]).read_bytes()
+        assert shard["rows"] <= 30
+        assert shard["bytes"] == len(data)
+        assert shard["sha256"] == hashlib.sha256(data).hexdigest()
+        assert len(data.splitlines()) == shard["rows"] + 1
+
+
+def test_write_shards_is_deterministic(
+    docs: list[nlp.Doc], tmp_path: Path
+) -> None:
+    """The same seed gives the same splits regardless of document order."""
+    first = sharding.write_shards(docs, tmp_path / "first", seed=7)
+    second = sharding.write_shards(docs[::-1], tmp_path / "second", seed=7)
+    assert first["rows"] == second["rows"]
+    third = sharding.write_shards(docs, tmp_path / "third", seed=7)
+    assert first == third
+
+
+def test_write_shards_rolls_by_size(
+    docs: list[nlp.Doc], tmp_path: Path
+) -> None:
+    """Shards roll over once they reach the byte limit."""
+    manifest = sharding.write_shards(
+        docs, tmp_path, max_rows=0, max_bytes=1000, ratios=(1, 0, 0)
+    )
+    assert len(manifest["shards"]) > 1
+    assert all(s["split"] == "train" for s in manifest["shards"])
+
+
+def test_write_shards_invalid_ratios(
+    docs: list[nlp.Doc], tmp_path: Path
+) -> None:
+    with pytest.raises(writing.WriteError):
+        sharding.write_shards(docs, tmp_path, ratios=(0, 0, 0))
+
+
+@pytest.mark.parametrize("stride", [0, -3])
+def test_write_shards_invalid_stride(
+    docs: list[nlp.Doc], tmp_path: Path, stride: int
+) -> None:
+    with pytest.raises(writing.WriteError):
+        sharding.write_shards(docs, tmp_path, ngram_stride=stride)
+    assert not (tmp_path / sharding.MANIFEST_NAME).exists()
+
+
+def test_write_shards_parallel(docs: list[nlp.Doc], tmp_path: Path) -> None:
+    """Shards written with worker processes are identical to serial ones."""
+    serial = sharding.write_shards(docs, tmp_path / "serial", ngram_size=3)
+    parallel = sharding.write_shards(
+        docs, tmp_path / "parallel", ngram_size=3, workers=2
+    )
+    assert parallel == serial
@@ -0,0 +1,120 @@
+# Standard library imports
+import argparse
+from pathlib import Path
+from typing import Callable
+
+# Third-party library imports
+import numpy as np
+import pytest
+
+# Local library imports
+from manx import console, load, nlp, snapshot
+from manx.parsing.tags import POS
+
+
+@pytest.fixture
+def docs(
+    make_docs: Callable[..., list[nlp.Doc]]
+) -> list[nlp.Doc]:
+    return make_docs(
+        4,
+        lambda d: d * 7,
+        lambda d, i: {
+            "lexel": f"ȝer{i % 3}",
+            "stripped_lexel": f"ȝer{i % 3}",
+            "grammel": "n" if i % 2 else "vpp",
+            "form": f"ȜERE{i}",
+            "stripped_form": f"ȝere{i}",
+            "_pos": POS.Noun if i % 2 else POS.Verb,
+        },
+    )
+
+
+@pytest.fixture
+def path(docs: list[nlp.Doc], tmp_path: Path) -> Path:
+    result = tmp_path / "laeme.snapshot"
+    snapshot.save_snapshot(docs, result)
+    return result
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_snapshot_round_trip(
+    docs: list[nlp.Doc], path: Path, mmap: bool
+) -> None:
+    """Docs loaded from a snapshot hold the same tokens."""
+    loaded = snapshot.Snapshot.open(path, mmap=mmap).docs(
+        nlp.IdScheme.Sequence
+    )
+    assert [d.label for d in loaded] == [d.label for d in docs]
+    assert [len(d) for d in loaded] == [len(d) for d in docs]
+    for want, have in zip(docs, loaded):
+        assert [t.asdict() | {"id": ""} for t in have[:]] == [
+            t.asdict() | {"id": ""} for t in want[:]
+        ]
+        assert have.text() == want.text()
+
+
+def test_snapshot_lazy_docs(path: Path) -> None:
+    """Tokens of a snapshot doc are only built when accessed."""
+    (*_, last) = snapshot.Snapshot.open(path).docs()
+    assert len(last) == 21
+    assert not hasattr(last, "_tokens")
+    assert last[3].form == "ȜERE3"
+    assert hasattr(last, "_tokens")
+
+
+def test_snapshot_corpus(docs: list[nlp.Doc], path: Path) -> None:
+    """The snapshot corpus reuses coded columns giving the same results."""
+    want = nlp.Corpus(docs)
+    have = snapshot.Snapshot.open(path).corpus()
+    for field in nlp.Field:
+        assert have.column(field).vocab == want.column(field).vocab
+        assert np.array_equal(
+            have.column(field).codes, want.column(field).codes
+        )
+    assert have.values(nlp.Field.Lexel, "ȝer1", of=nlp.Field.Form) == (
+        want.values(nlp.Field.Lexel, "ȝer1", of=nlp.Field.Form)
+    )
+    assert not any(hasattr(d, "_tokens") for d in have)
+
+
+def test_snapshot_version(path: Path) -> None:
+    """Snapshots of other versions are refused."""
+    arrays = dict(snapshot.load_arrays(path))
+    arrays["version"] = np.array([snapshot.SNAPSHOT_VERSION + 1])
+    with pytest.raises(snapshot.SnapshotError):
+        snapshot.Snapshot(arrays)
+    with pytest.raises(snapshot.SnapshotError):
+        snapshot.Snapshot({"format": arrays["labels"]})
+
+
+def test_load_snapshot(docs: list[nlp.Doc], path: Path) -> None:
+    """load reads docs from a snapshot instead of corpus files."""
+    loaded = load(snapshot=path)
+    assert [d.text(strip=True) for d in loaded] == [
+        d.text(strip=True) for d in docs
+    ]
+
+
+def test_console_snapshot(docs: list[nlp.Doc], mocker, tmp_path: Path) -> None:
+    """See if the snapshot subcommand saves the loaded corpus."""
+    mocker.patch("manx.console.load", return_value=docs)
+    output = tmp_path / "laeme.snapshot"
+    mocker.patch(
+        "argparse.ArgumentParser.parse_args",
+        return_value=argparse.Namespace(
+            command="snapshot",
+            from_web=False,
+            verbose=False,
+            root="",
+            output=str(output),
+        )
+    )
+    console.main()
+    assert len(snapshot.Snapshot.open(output)) == len(docs)
+
+
+def test_load_snapshot_selection(path: Path) -> None:
+    """Snapshot docs are selected by label."""
+    loaded = load(snapshot=path, include=["d*"], exclude=["d[02]"])
+    assert [d.label for d in loaded] == ["d1", "d3"]
@@ -1,6 +1,9 @@
 # Standard library imports
 from contextlib import redirect_stdout, redirect_stderr
 from io import StringIO
+import json
+from pathlib import Path
+from typing import Any, Callable
 
 # Third-party library imports
 import pytest
@@ -49,7 +52,10 @@ def test_marshall_string(
     """Test if all string formats are being marshalled."""
     with open("/dev/null") as f:
         with redirect_stderr(f), redirect_stdout(f):
-            writing.marshall_string(docs=docs, fmt=fmt, verbose=verbose)
+            result = writing.marshall_string(
+                docs=docs, fmt=fmt, verbose=verbose
+            )
+            assert len(list(result)) == len(docs)
 
 
 
@@ -63,7 +69,8 @@ def test_marshall_csv(docs: list[nlp.Doc], verbose: bool) -> None:
     """Test if invoked CSV marshalling function works as expected."""
     with open("/dev/null") as f:
         with redirect_stderr(f), redirect_stdout(f):
-            writing.marshall_csv(docs=docs, verbose=verbose)
+            result = list(writing.marshall_csv(docs=docs, verbose=verbose))
+    assert [r["id"] for r in result] == list(range(len(result)))
 
 
 @pytest.mark.parametrize(
@@ -91,3 +98,377 @@ def test_write(
     with open("/dev/null") as f:
         with redirect_stderr(f), redirect_stdout(f):
             writing.write(docs=docs, fmt=fmt, output=output, verbose=verbose)
+
+
+@pytest.mark.parametrize(
+    "fmt",
+    [
+        writing.Format.FullText,
+        writing.Format.StripText,
+        writing.Format.JSONLines,
+    ]
+)
+def test_write_streams_documents(
+    docs: list[nlp.Doc], fmt: writing.Format
+) -> None:
+    """Streamed output matches documents joined with newlines."""
+    output = StringIO("")
+    writing.write(docs=iter(docs), fmt=fmt, output=output, verbose=False)
+    want = "\n".join(writing.marshall_string(docs, fmt))
+    assert output.getvalue() == want
+
+
+@pytest.fixture
+def labelled_docs(
+    make_docs: Callable[..., list[nlp.Doc]]
+) -> list[nlp.Doc]:
+    return make_docs(10, 40)
+
+
+@pytest.mark.parametrize("buffer", [1, 5, 1000])
+def test_marshall_csv_shuffle(
+    labelled_docs: list[nlp.Doc], buffer: int
+) -> None:
+    """Shuffled output is a reproducible permutation of chunk lines."""
+    def _run(seed: int | None) -> list[tuple[str, str]]:
+        rows = writing.marshall_csv(
+            labelled_docs,
+            ngram_size=3,
+            chunk_size=10,
+            shuffle_seed=seed,
+            shuffle_buffer=buffer,
+        )
+        return [(r["input"], r["target"]) for r in rows]
+
+    plain, first, second = _run(None), _run(42), _run(42)
+    assert first == second
+    assert sorted(first) == sorted(plain)
+    if buffer > 1:
+        assert first != plain
+
+
+@pytest.mark.parametrize("stride", [0, -3])
+def test_ngram_stride_error(labelled_docs: list[nlp.Doc], stride: int) -> None:
+    """Ngram strides must be positive."""
+    chunks = list(writing.chunk(labelled_docs))
+    with pytest.raises(writing.WriteError):
+        writing.marshall_chunk(chunks[0], 3, stride)
+    with pytest.raises(writing.WriteError):
+        list(writing.marshall_csv(labelled_docs, ngram_stride=stride))
+
+
+@pytest.mark.parametrize("buffer", [0, -1])
+def test_shuffle_buffer_error(
+    labelled_docs: list[nlp.Doc], buffer: int
+) -> None:
+    """Shuffle buffers must hold at least one chunk."""
+    with pytest.raises(writing.WriteError):
+        writing.shuffle(writing.chunk(labelled_docs), 42, buffer)
+
+
+def test_marshall_csv_ngrams(labelled_docs: list[nlp.Doc]) -> None:
+    """Lines hold stripped forms and lexels of consecutive tokens."""
+    rows = list(writing.marshall_csv(labelled_docs, ngram_size=3))
+    want = [
+        (
+            " ".join(t.stripped_form for t in ngram),
+            " ".join(t.stripped_lexel for t in ngram),
+        )
+        for d in labelled_docs
+        for ngram in nlp.ngrams(d[:], n=3)
+    ]
+    assert [(r["input"], r["target"]) for r in rows] == want
+
+
+@pytest.mark.parametrize("shuffle_seed", [None, 3])
+def test_marshall_csv_parallel(
+    labelled_docs: list[nlp.Doc], shuffle_seed: int | None
+) -> None:
+    """Parallel line generation gives the same output as serial mode."""
+    kwargs = dict(ngram_size=4, chunk_size=7, shuffle_seed=shuffle_seed)
+    serial = list(writing.marshall_csv(labelled_docs, **kwargs))
+    parallel = list(
+        writing.marshall_csv(labelled_docs, workers=2, **kwargs)
+    )
+    assert parallel == serial
+
+
+@pytest.mark.parametrize(
+    "fmt",
+    [
+        writing.Format.Parquet,
+        writing.Format.Arrow,
+    ]
+)
+def test_write_columnar_tokens(
+    labelled_docs: list[nlp.Doc],
+    fmt: writing.Format,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Token columns round-trip with one batch per filled row group."""
+    pa = pytest.importorskip("pyarrow")
+    monkeypatch.setattr(writing, "COLUMNAR_BATCH_ROWS", 100)
+    path = tmp_path / "tokens"
+    with open(path, "w") as output:
+        writing.write(labelled_docs, output, fmt=fmt, verbose=False)
+    table = _read_columnar(path, fmt)
+    assert table.num_rows == sum(len(d) for d in labelled_docs)
+    assert table.column("form").to_pylist() == [
+        t.form for d in labelled_docs for t in d[:]
+    ]
+    assert table.column("label").to_pylist()[:1] == ["d0"]
+    for name in ("lexel", "grammel", "pos"):
+        assert pa.types.is_dictionary(table.schema.field(name).type)
+    assert len(table.to_batches()) == 4
+
+
+@pytest.mark.parametrize(
+    "fmt",
+    [
+        writing.Format.T5Parquet,
+        writing.Format.T5Arrow,
+    ]
+)
+def test_write_columnar_t5(
+    labelled_docs: list[nlp.Doc], fmt: writing.Format, tmp_path: Path
+) -> None:
+    """T5 rows in columnar output equal the CSV rows."""
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "t5"
+    with open(path, "w") as output:
+        writing.write(
+            labelled_docs, output, fmt=fmt, verbose=False, ngram_size=3
+        )
+    table = _read_columnar(path, fmt)
+    want = list(writing.marshall_csv(labelled_docs, ngram_size=3))
+    assert table.to_pylist() == want
+
+
+@pytest.mark.parametrize(
+    "fmt, schema",
+    [
+        (writing.Format.Parquet, writing.token_schema),
+        (writing.Format.Arrow, writing.token_schema),
+        (writing.Format.T5Parquet, writing.t5_schema),
+        (writing.Format.T5Arrow, writing.t5_schema),
+    ]
+)
+def test_write_columnar_empty(
+    fmt: writing.Format, schema: Any, tmp_path: Path
+) -> None:
+    """Columnar output of no docs is a valid file with the schema."""
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "empty"
+    with open(path, "w") as output:
+        writing.write([], output, fmt=fmt, verbose=False, ngram_size=3)
+    table = _read_columnar(path, fmt)
+    assert table.num_rows == 0
+    assert table.schema.names == schema().names
+
+
+def test_write_columnar_text_output(docs: list[nlp.Doc]) -> None:
+    """Columnar formats refuse outputs without a binary buffer."""
+    pytest.importorskip("pyarrow")
+    with pytest.raises(writing.OutputError):
+        writing.write(docs, StringIO(), fmt=writing.Format.Parquet)
+
+
+def _read_columnar(path: Path, fmt: writing.Format) -> Any:
+    import pyarrow as pa
+    from pyarrow import parquet as pq
+
+    if fmt in (writing.Format.Parquet, writing.Format.T5Parquet):
+        return pq.read_table(path)
+    with pa.ipc.open_stream(path) as reader:
+        return reader.read_all()
+
+
+@pytest.mark.parametrize(
+    "texts",
+    [
+        [],
+        ["Lemmatize: þe"],
+        ["a", "", "ȝ ye"],
+    ]
+)
+def test_byt5_ids(texts: list[str]) -> None:
+    """Byte ids match the ByT5 tokenizer: bytes shifted by three plus EOS."""
+    ids, lengths = writing.byt5_ids(texts)
+    want = [
+        [b + writing.BYT5_OFFSET for b in t.encode()] + [writing.BYT5_EOS]
+        for t in texts
+    ]
+    assert ids.tolist() == [i for w in want for i in w]
+    assert lengths.tolist() == [len(w) for w in want]
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_write_byte_ids(
+    labelled_docs: list[nlp.Doc], tmp_path: Path, mmap: bool
+) -> None:
+    """Rows of the t5-bytes archive decode back to prefixed T5 lines."""
+    path = tmp_path / "t5.npz"
+    with open(path, "w") as output:
+        writing.write(
+            labelled_docs,
+            output,
+            fmt=writing.Format.T5Bytes,
+            verbose=False,
+            ngram_size=3,
+        )
+    data = writing.load_byte_ids(path, mmap=mmap)
+    rows = list(writing.marshall_csv(labelled_docs, ngram_size=3))
+    assert data["ids"].tolist() == [r["id"] for r in rows]
+
+    def _decode(name: str, i: int) -> str:
+        start, end = data[f"{name}_offsets"][i : i + 2]
+        ids = data[f"{name}_ids"][start:end]
+        assert ids[-1] == writing.BYT5_EOS
+        assert data[f"{name}_lengths"][i] == end - start
+        return bytes((ids[:-1] - writing.BYT5_OFFSET).astype("u1")).decode()
+
+    for i, r in enumerate(rows):
+        assert _decode("input", i) == f"{r['prefix']}: {r['input']}"
+        assert _decode("target", i) == r["target"]
+
+
+@pytest.mark.parametrize("bounds", [(), (25, 30)])
+@pytest.mark.parametrize("window", [0, 7, 1000])
+def test_marshall_csv_buckets(
+    labelled_docs: list[nlp.Doc], bounds: tuple[int, ...], window: int
+) -> None:
+    """Length ordering permutes lines within windows and counts them."""
+    stats = writing.BucketStats(bounds)
+    plain = list(writing.marshall_csv(labelled_docs, ngram_size=3))
+    rows = list(
+        writing.marshall_csv(
+            labelled_docs,
+            ngram_size=3,
+            bucket_window=window,
+            bucket_bounds=bounds,
+            bucket_stats=stats,
+        )
+    )
+    assert [r["id"] for r in rows] == list(range(len(plain)))
+
+    def _pairs(rs: list[writing.T5line]) -> list[tuple[str, str]]:
+        return [(r["input"], r["target"]) for r in rs]
+
+    def _key(r: writing.T5line) -> int:
+        length = len(r["input"].encode()) + len(r["target"].encode())
+        return stats.bucket(length) if bounds else length
+
+    if not window:
+        assert _pairs(rows) == _pairs(plain)
+    else:
+        for start in range(0, len(rows), window):
+            want = sorted(plain[start : start + window], key=_key)
+            assert _pairs(rows[start : start + window]) == _pairs(want)
+
+    table = stats.table()
+    assert sum(table.columns["rows"].tolist()) == len(plain)
+    assert all(0 <= p < 1 for p in table.columns["padding"].tolist())
+
+
+@pytest.mark.parametrize("stride", [1, 2, 3])
+def test_marshall_csv_stride(labelled_docs: list[nlp.Doc], stride: int) -> None:
+    """Ngrams strided by at most their size still cover every token."""
+    rows = list(
+        writing.marshall_csv(
+            labelled_docs, ngram_size=3, chunk_size=10, ngram_stride=stride
+        )
+    )
+    dense = list(
+        writing.marshall_csv(labelled_docs, ngram_size=3, chunk_size=10)
+    )
+    inputs = [r["input"] for r in rows]
+    assert set(inputs) <= {r["input"] for r in dense}
+    if stride == 1:
+        assert inputs == [r["input"] for r in dense]
+    covered = {form for i in inputs for form in i.split()}
+    assert covered == {t.stripped_form for d in labelled_docs for t in d[:]}
+
+
+@pytest.mark.parametrize(
+    "mode, pairs, want",
+    [
+        (writing.Dedup.Off, [("a b", "x"), ("a b", "x")], 2),
+        (writing.Dedup.Exact, [("a b", "x"), ("a b", "x")], 1),
+        (writing.Dedup.Exact, [("a b", "x"), ("A b", "x")], 2),
+        (writing.Dedup.Near, [("a b", "x"), ("A, b", "x")], 1),
+        (writing.Dedup.Near, [("þe", "x"), ("þé", "x"), ("þe", "y")], 2),
+    ]
+)
+def test_dedup_filter(
+    mode: writing.Dedup, pairs: list[tuple[str, str]], want: int
+) -> None:
+    """Duplicate pairs are dropped and counted."""
+    dedup = writing.DedupFilter(mode)
+    kept = list(dedup(pairs))
+    assert len(kept) == want
+    assert kept[0] == pairs[0]
+    assert dedup.rows == len(pairs)
+    assert dedup.dropped == len(pairs) - want
+
+
+def test_marshall_csv_dedup() -> None:
+    """Repeated passages yield each distinct line once with running ids."""
+    tokens = [
+        Token(
+            lexel=f"l{i % 4}",
+            stripped_lexel=f"l{i % 4}",
+            grammel="",
+            form=f"F{i % 4}",
+            stripped_form=f"F{i % 4}",
+            sequence=i,
+            _pos=POS.Undef,
+        ) for i in range(40)
+    ]
+    dedup = writing.DedupFilter()
+    rows = list(
+        writing.marshall_csv([nlp.Doc(tokens)], ngram_size=3, dedup=dedup)
+    )
+    assert len(rows) == 4
+    assert [r["id"] for r in rows] == list(range(4))
+    assert dedup.dropped == 38 - 4
+
+
+@pytest.fixture
+def escaped_docs() -> list[nlp.Doc]:
+    tokens = [
+        Token(
+            lexel=lexel,
+            stripped_lexel=lexel.strip('"'),
+            grammel="n\\pl",
+            form=form,
+            stripped_form=form.lower(),
+            sequence=i,
+            _pos=POS.Noun,
+        )
+        for i, (lexel, form) in enumerate(
+            [("ȝer", "ȝeres"), ('"quoted"', "Þe\tend"), ("", "")]
+        )
+    ]
+    return [nlp.Doc(tokens, label="dé"), nlp.Doc([], label="")]
+
+
+def test_doc_json(escaped_docs: list[nlp.Doc]) -> None:
+    """Fast JSON output is identical to dumping document dicts."""
+    for d in escaped_docs:
+        assert writing.doc_json(d) == json.dumps(d.asdict())
+
+
+def test_json_columns(escaped_docs: list[nlp.Doc]) -> None:
+    """Column documents hold a list per field equal to token values."""
+    lines = list(
+        writing.marshall_string(escaped_docs, writing.Format.JSONColumns)
+    )
+    for d, line in zip(escaped_docs, lines):
+        record = json.loads(line)
+        assert record["length"] == len(d)
+        tokens = d.asdict()["tokens"]
+        assert isinstance(tokens, list)
+        for name, values in record["columns"].items():
+            assert values == [t[name] for t in tokens]
+        assert line == writing._compact_json(writing.doc_columns(d))